@@ -118,6 +118,7 @@ class TFT18(framebuf.FrameBuffer):
         
         self.TFT_init()
         self.buffer = bytearray(self.height * self.width * 2)
+        self.bg_layers = []
         super().__init__(self.buffer, self.width, self.height, framebuf.RGB565)
         
         self.ST7735_CS.value(LOW)
@@ -312,3 +313,47 @@ class TFT18(framebuf.FrameBuffer):
         self.ST7735_DC.value(DAT)
         self.ST7735_SPI.write(self.buffer)
         self.ST7735_CS.value(HIGH)
+
+
+    def save_background(self, x = 0, y = 0, w = None, h = None):
+        # Retain a region of the current frame as part of the static background layer
+        if(w is None):
+            w = (self.width - x)
+        if(h is None):
+            h = (self.height - y)
+        
+        layer = bytearray(w * h * 2)
+        self.bg_layers.append((x, y, w, h, layer))
+        self.copy_layer(x, y, w, h, layer, False)
+        
+        
+    def clear_background(self):
+        self.bg_layers = []
+        
+        
+    def restore_background(self):
+        # Start a new frame from the retained layers instead of redrawing the artwork
+        for x, y, w, h, layer in self.bg_layers:
+            self.copy_layer(x, y, w, h, layer, True)
+            
+            
+    def copy_layer(self, x, y, w, h, layer, restore):
+        frame = memoryview(self.buffer)
+        stride = (self.width * 2)
+        
+        if((x == 0) and (w == self.width)):
+            if(restore):
+                frame[(y * stride):((y + h) * stride)] = layer
+            else:
+                layer[:] = frame[(y * stride):((y + h) * stride)]
+            return
+        
+        layer = memoryview(layer)
+        row = (w * 2)
+        start = ((y * stride) + (x * 2))
+        for r in range(0, (h * row), row):
+            if(restore):
+                frame[start:(start + row)] = layer[r:(r + row)]
+            else:
+                layer[r:(r + row)] = frame[start:(start + row)]
+            start += stride
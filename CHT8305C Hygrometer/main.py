@@ -1,11 +1,14 @@
 from machine import Pin, I2C
 from ST7735 import TFT18
 from CHT8305C import CHT8305C
-from time import sleep_ms
+from time import sleep_ms, ticks_us, ticks_diff
 from img import image_data, image_width, image_height
 import math
 
 
+SHOW_FRAME_TIME = False         # True prints how long each frame takes to build, in us
+
+
 LED = Pin(25, Pin.OUT)
 
 i2c = I2C(id = 0, scl = Pin(5), sda = Pin(4), freq = 100000)
@@ -65,20 +68,28 @@ def circle(xc, yc, r, c):
         tft.hline((xc - a), (yc - i), (a * 2), c)
     
 
-while(True):
-    tft.fill(tft.BLACK)
-    tft.text("CHT8305C Hygrometer", 6, 6, tft.CYAN)
-    draw_dials()
+tft.fill(tft.BLACK)
+tft.text("CHT8305C Hygrometer", 6, 6, tft.CYAN)
+draw_dials()
+tft.text("RH/%:", 20, 100, tft.YELLOW)
+tft.text("T/'C:", 100, 100, tft.YELLOW)
+tft.save_background()
     
-    tft.text("RH/%:", 20, 100, tft.YELLOW)
-    tft.text("T/'C:", 100, 100, tft.YELLOW)
+
+while(True):
+    t0 = ticks_us()
+    tft.restore_background()
     
     draw_dial(39, 55, rht.humidity, 0, 100, 0, tft.BLUE)
     draw_dial(119, 55, rht.temperature, 0, 60, 1, tft.RED)
+    build_us = ticks_diff(ticks_us(), t0)
     
     print("T/'C: " + str(rht.temperature))
     print("RH/%: " + str(rht.humidity))
     
+    if(SHOW_FRAME_TIME):
+        print("Frame build/us: " + str(build_us))
+    
     LED.value(1)
     sleep_ms(500)
     LED.value(0)
@@ -0,0 +1,120 @@
+from micropython import const, schedule
+from machine import Timer
+from utime import ticks_ms, ticks_add, ticks_diff
+
+
+DS18B20_CONV_TIME_9_BIT_MS = const(94)
+
+DS18B20_MIN_RESOLUTION = const(9)
+DS18B20_MAX_RESOLUTION = const(12)
+
+
+class DS18B20_Sampler():
+    '''
+    Non-blocking DS18B20 sampler. One skip-ROM convert starts a conversion on
+    every sensor of the bus at once and returns immediately; the results are
+    collected when the slowest sensor is due and the next conversion is
+    started straight away, so it overlaps whatever the caller does with the
+    previous readings.
+    '''
+    def __init__(self, ds, roms, resolution = DS18B20_MAX_RESOLUTION):
+        self.ds = ds
+        self.roms = roms
+        self.resolution = [DS18B20_MAX_RESOLUTION] * len(roms)
+        self.temperatures = [None] * len(roms)
+        
+        self.conversion_ms = (DS18B20_CONV_TIME_9_BIT_MS << (DS18B20_MAX_RESOLUTION - DS18B20_MIN_RESOLUTION))
+        self.due = ticks_ms()
+        self.converting = False
+        
+        self.timer = None
+        self.callback = None
+        
+        for i in range(len(roms)):
+            self.set_resolution(i, resolution)
+        
+    
+    def set_resolution(self, index, bits):
+        if((bits < DS18B20_MIN_RESOLUTION) or (bits > DS18B20_MAX_RESOLUTION)):
+            raise ValueError("DS18B20 resolution must be 9 to 12 bits")
+        
+        # Keep the alarm registers, only replace the configuration byte
+        scratch = self.ds.read_scratch(self.roms[index])
+        self.ds.write_scratch(self.roms[index], bytes([scratch[2], scratch[3], (((bits - 9) << 5) | 0x1F)]))
+        self.resolution[index] = bits
+        
+        # One convert serves all sensors, so the slowest one sets the pace
+        self.conversion_ms = (DS18B20_CONV_TIME_9_BIT_MS << (max(self.resolution) - DS18B20_MIN_RESOLUTION))
+        
+        
+    def start(self):
+        self.ds.convert_temp()
+        self.due = ticks_add(ticks_ms(), self.conversion_ms)
+        self.converting = True
+        
+        if(self.timer is not None):
+            self.timer.init(mode = Timer.ONE_SHOT, period = self.conversion_ms, callback = self.timer_handler)
+            
+            
+    def ready(self):
+        return (self.converting and (ticks_diff(ticks_ms(), self.due) >= 0))
+    
+    
+    def collect(self):
+        for i in range(len(self.roms)):
+            try:
+                scratch = self.ds.read_scratch(self.roms[i])
+            except Exception:
+                # CRC error or missing sensor, keep the previous reading
+                continue
+            
+            raw = ((scratch[1] << 8) | scratch[0])
+            if(raw & 0x8000):
+                raw -= 0x10000
+                
+            # The low bits are undefined below 12 bit resolution
+            raw &= ~((1 << (DS18B20_MAX_RESOLUTION - self.resolution[i])) - 1)
+            self.temperatures[i] = (raw / 16.0)
+        
+        self.converting = False
+        
+        
+    def poll(self):
+        '''
+        Call from the main loop. Returns True when a new set of readings was
+        collected; the next conversion is already running by then.
+        '''
+        if not self.ready():
+            return False
+        
+        self.collect()
+        self.start()
+        return True
+    
+    
+    def start_auto(self, callback = None):
+        '''
+        Timer driven alternative to poll(): collection is scheduled when the
+        conversion is due and callback(sampler) runs with the new readings.
+        '''
+        self.callback = callback
+        self.timer = Timer()
+        self.start()
+        
+        
+    def stop_auto(self):
+        if(self.timer is not None):
+            self.timer.deinit()
+            self.timer = None
+            
+            
+    def timer_handler(self, timer):
+        schedule(self.scheduled_collect, None)
+        
+        
+    def scheduled_collect(self, _):
+        self.collect()
+        self.start()
+        
+        if(self.callback is not None):
+            self.callback(self)
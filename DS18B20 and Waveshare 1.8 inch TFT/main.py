@@ -1,11 +1,15 @@
 from ST7735 import TFT18
 from machine import Pin
-from utime import sleep_ms
+from utime import sleep_ms, ticks_us, ticks_diff
 from onewire import OneWire
 from ds18x20 import DS18X20
+from DS18B20_Sampler import DS18B20_Sampler
 import array as array
 
 
+SHOW_FRAME_TIME = False         # True prints how long each frame takes to build, in us
+
+
 LED = Pin(25, Pin.OUT)
 
 lcd = TFT18()
@@ -14,6 +18,10 @@ ow = OneWire(Pin(28))
 ds = DS18X20(ow)
 roms = ds.scan()
 
+# 12 bit: 750 ms per conversion, 9 bit: 94 ms
+RESOLUTION = 12
+sampler = DS18B20_Sampler(ds, roms, RESOLUTION)
+
 
 def map_value(v, x_min, x_max, y_min, y_max):
     return int(y_min + (((y_max - y_min)/(x_max - x_min)) * (v - x_min)))
@@ -90,23 +98,34 @@ def temp_bar(x_pos, y_pos, bar):
     for i in range (0, 3):
         lcd.line((x_pos + i), y_pos, (x_pos + i), bar, lcd.RED)
     
+
+lcd.fill(lcd.BLACK)
+draw_background()
+lcd.save_background()
+
+sampler.start()
+
            
 while True:
+    # The UI stays free while the sensors convert; the next conversion is
+    # already running while this frame is built and sent.
+    if not sampler.poll():
+        sleep_ms(10)
+        continue
+    
     i = 0
     LED.toggle()
     tmp = array.array('f', [0, 0])
-    lcd.fill(lcd.BLACK)
-    draw_background()
-    
-    ds.convert_temp()
-    sleep_ms(750)
 
     for rom in roms:
         j = int.from_bytes(rom, "big")
-        tmp[i] = ds.read_temp(rom)
+        if(sampler.temperatures[i] is not None):
+            tmp[i] = sampler.temperatures[i]
         print("ROM Code: " + str("%08x" % j) + " - Temp/Deg. C: "  + str("%2.1f" % tmp[i]))       
         i += 1
     
+    t0 = ticks_us()
+    lcd.restore_background()
     lcd.text(str("%2.1f" % tmp[0]), 18, 16, lcd.GREEN)
     lcd.text(str("%2.1f" % tmp[1]), 75, 16, lcd.GREEN)
     
@@ -115,6 +134,10 @@ while True:
     
     temp_bar(32, 137, bar1)
     temp_bar(92, 137, bar2)
+    build_us = ticks_diff(ticks_us(), t0)
+    
+    if(SHOW_FRAME_TIME):
+        print("Frame build/us: " + str(build_us))
     
     lcd.display()           
 
@@ -21,6 +21,12 @@ PCF8563_ALARM_WEEKDAY = const(0x0C)
 PCF8563_CLKOUT = const(0x0D)     
 PCF8563_TCONTROL = const(0x0E)
 
+PCF8563_CLKOUT_1HZ = const(0x83)
+PCF8563_CLKOUT_OFF = const(0x00)
+
+# Packed BCD byte -> decimal, indexed by the raw register value
+BCD_TO_DECIMAL = bytes([(((i >> 4) * 10) + (i & 0x0F)) for i in range(256)])
+
 
 class PCF8563():
     def __init__(self, _i2c):
@@ -28,6 +34,7 @@ class PCF8563():
         self.alarm_off = const(0x01)
         self.i2c = _i2c
         self.i2c_address = PCF8563_I2C_address
+        self.time_buf = bytearray(7)
         
         self.init()
         
@@ -51,7 +58,7 @@ class PCF8563():
     
     
     def bcd_to_decimal(self, value):
-        return ((value & 0x0F) + (((value & 0xF0) >> 0x04) * 0x0A))
+        return BCD_TO_DECIMAL[value & 0xFF]
 
 
     def decimal_to_bcd(self, value):
@@ -67,13 +74,17 @@ class PCF8563():
         
         
     def get(self):
-        second = self.bcd_to_decimal((self.read(PCF8563_SECOND) & 0x7F))
-        minute = self.bcd_to_decimal((self.read(PCF8563_MINUTE) & 0x7F))
-        hour = self.bcd_to_decimal((self.read(PCF8563_HOUR) & 0x3F))
-        day = self.bcd_to_decimal((self.read(PCF8563_DAY) & 0x07))
-        date = self.bcd_to_decimal((self.read(PCF8563_DATE) & 0x3F))
-        month = self.bcd_to_decimal((self.read(PCF8563_MONTH) & 0x1F))
-        year = self.bcd_to_decimal(self.read(PCF8563_YEAR))
+        # Seconds to years in one transaction, so the fields are coherent
+        self.i2c.readfrom_mem_into(self.i2c_address, PCF8563_SECOND, self.time_buf)
+        buf = self.time_buf
+        
+        second = BCD_TO_DECIMAL[buf[0] & 0x7F]
+        minute = BCD_TO_DECIMAL[buf[1] & 0x7F]
+        hour = BCD_TO_DECIMAL[buf[2] & 0x3F]
+        date = BCD_TO_DECIMAL[buf[3] & 0x3F]
+        day = BCD_TO_DECIMAL[buf[4] & 0x07]
+        month = BCD_TO_DECIMAL[buf[5] & 0x1F]
+        year = BCD_TO_DECIMAL[buf[6]]
         
         return hour, minute, second, day, date, month, year
     
@@ -134,6 +145,19 @@ class PCF8563():
             return 0
         
         
+    def enable_second_tick(self, pin, handler):
+        # 1 Hz on CLKOUT (open drain) into a pin IRQ, so callers only read
+        # and redraw when the seconds actually change
+        self.write(PCF8563_CLKOUT, PCF8563_CLKOUT_1HZ)
+        pin.init(Pin.IN, Pin.PULL_UP)
+        pin.irq(trigger = Pin.IRQ_FALLING, handler = handler)
+        
+        
+    def disable_second_tick(self, pin):
+        pin.irq(handler = None)
+        self.write(PCF8563_CLKOUT, PCF8563_CLKOUT_OFF)
+        
+        
     def clear_alarm(self):
         temp = 0
         temp = self.read(PCF8563_CONTROL2)
@@ -12,6 +12,8 @@ LCD_D5 = const(11)
 LCD_D6 = const(12)
 LCD_D7 = const(28)
 
+RTC_CLKOUT = const(6)
+
 
 i = 0
 index = 0
@@ -23,6 +25,7 @@ day = 1
 date = 31
 month = 12
 year = 21
+second_tick = False
 
 
 LED = Pin(25, Pin.OUT)
@@ -43,6 +46,15 @@ rtc = PCF8563(i2c)
 rtc.set(hour, minute, second, day, date, month, year)
 
 
+def tick_handler(pin):
+    global second_tick
+    
+    second_tick = True
+
+
+rtc.enable_second_tick(Pin(RTC_CLKOUT), tick_handler)
+
+
 def set_parameter(value, value_max, value_min, x_pos, y_pos):
     if(D_Key.value() == False):
         BUZ.toggle()
@@ -74,7 +86,7 @@ def set_parameter(value, value_max, value_min, x_pos, y_pos):
 
 
 def RTC_run():
-    global set_read, i
+    global set_read, i, second_tick
     
     if(B_Key.value() == False):
         sleep_ms(60)
@@ -84,9 +96,12 @@ def RTC_run():
     
     if(set_read == 1):
         set_time()    
-    elif(set_read == 0):
+    elif(second_tick):
+        second_tick = False
         rtc_read()
         rtc_display()
+    else:
+        sleep_ms(10)
         
         
 def set_time():
@@ -176,7 +191,6 @@ def rtc_display():
     lcd.goto_xy(10, 1)
     lcd.put_str(str("%02u" %year))
     LED.toggle()
-    sleep_ms(990)
 
 
 while(True):
@@ -0,0 +1,125 @@
+from machine import Pin, Timer, mem32
+from micropython import const
+from utime import ticks_us, ticks_diff
+
+
+IO_BANK0_BASE = const(0x40014000)
+PWM_BASE = const(0x40050000)
+
+PWM_CH_STRIDE = const(0x14)
+PWM_CSR = const(0x00)
+PWM_DIV = const(0x04)
+PWM_CTR = const(0x08)
+PWM_CC = const(0x0C)
+PWM_TOP = const(0x10)
+
+PWM_CSR_EN = const(0x01)
+PWM_CSR_DIVMODE_RISE = const(0x20)      # count rising edges on the channel B pin
+PWM_CSR_DIVMODE_FALL = const(0x30)      # count falling edges on the channel B pin
+
+GPIO_FUNC_PWM = const(4)
+
+COUNTER_MASK = const(0xFFFF)
+
+DEFAULT_GATE_MS = const(100)
+DEFAULT_SAMPLE_MS = const(10)
+
+
+class PWM_Counter():
+    
+    def __init__(self, pin, gate_ms = DEFAULT_GATE_MS, divider = 1, edge = PWM_CSR_DIVMODE_RISE):
+        if((pin & 1) == 0):
+            raise ValueError("Edge counting needs a PWM channel B pin, i.e. an odd GPIO")
+            
+        self.pin = pin
+        self.slice = (pin >> 1) & 7
+        self.base = PWM_BASE + (self.slice * PWM_CH_STRIDE)
+        self.edge = edge
+        
+        self.timer = Timer()
+        
+        self.counts = 0
+        self.last_ctr = 0
+        self.last_us = 0
+        self.gate_counts = 0
+        self.gate_us = 0
+        self.ticks = 0
+        self.ready = False
+        
+        Pin(pin, Pin.IN)
+        mem32[IO_BANK0_BASE + (8 * pin) + 4] = GPIO_FUNC_PWM
+        
+        self.set_divider(divider)
+        self.set_gate(gate_ms)
+        
+        
+    def set_divider(self, divider):
+        # The divider trades resolution for range: the 16 bit counter is read every
+        # DEFAULT_SAMPLE_MS, so it must not see more than 65535 counts in that time
+        if(divider < 1):
+            divider = 1
+        elif(divider > 255):
+            divider = 255
+            
+        self.divider = divider
+        
+        mem32[self.base + PWM_CSR] = 0
+        mem32[self.base + PWM_DIV] = divider << 4
+        mem32[self.base + PWM_TOP] = COUNTER_MASK
+        mem32[self.base + PWM_CTR] = 0
+        mem32[self.base + PWM_CSR] = self.edge | PWM_CSR_EN
+        
+        self.last_ctr = 0
+        self.counts = 0
+        self.last_us = ticks_us()
+        
+        
+    def set_gate(self, gate_ms):
+        if(gate_ms < DEFAULT_SAMPLE_MS):
+            gate_ms = DEFAULT_SAMPLE_MS
+            
+        self.gate_ms = gate_ms
+        self.ticks_per_gate = gate_ms // DEFAULT_SAMPLE_MS
+        self.ticks = 0
+        self.ready = False
+        
+        self.timer.init(mode = Timer.PERIODIC, period = DEFAULT_SAMPLE_MS, callback = self.timer_handler)
+        
+        
+    def max_frequency(self):
+        return (COUNTER_MASK * self.divider * 1000) // DEFAULT_SAMPLE_MS
+    
+    
+    def resolution(self):
+        return (self.divider * 1000) / self.gate_ms
+        
+        
+    def timer_handler(self, timer):
+        ctr = mem32[self.base + PWM_CTR] & COUNTER_MASK
+        now = ticks_us()
+        
+        self.counts += (ctr - self.last_ctr) & COUNTER_MASK
+        self.last_ctr = ctr
+        self.ticks += 1
+        
+        if(self.ticks >= self.ticks_per_gate):
+            # Use the measured gate length so timer callback latency does not skew the result
+            self.gate_counts = self.counts
+            self.gate_us = ticks_diff(now, self.last_us)
+            self.last_us = now
+            self.counts = 0
+            self.ticks = 0
+            self.ready = True
+            
+            
+    def frequency(self):
+        if(self.gate_us <= 0):
+            return 0
+        
+        return (self.gate_counts * self.divider * 1000000) / self.gate_us
+    
+    
+    def deinit(self):
+        self.timer.deinit()
+        mem32[self.base + PWM_CSR] = 0
+        Pin(self.pin, Pin.IN)                   # hand the pin back to SIO
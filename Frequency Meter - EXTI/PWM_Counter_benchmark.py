@@ -0,0 +1,76 @@
+# Loop a known PWM output back to the meter input (jumper GP16 -> GP15) and compare
+# the EXTI timestamp method with the PWM slice counter for accuracy and CPU load.
+
+from machine import Pin, PWM
+from utime import sleep_ms, ticks_ms, ticks_us, ticks_diff
+from PWM_Counter import PWM_Counter
+
+
+TEST_FREQUENCIES = (100, 1000, 10000, 50000, 200000, 1000000)
+RUN_MS = 1000
+EXTI_MAX_HZ = 50000         # above this the pin IRQ starves the interpreter completely
+
+
+t_diff = 0
+trap = True
+first_edge = 0
+
+source = PWM(Pin(16))
+interrupt_channel = Pin(15, Pin.IN)
+
+
+def interrupt_handler(pin):
+    global t_diff, trap, first_edge
+    
+    interrupt_channel.irq(handler = None)
+    
+    if(trap == True):
+        first_edge = ticks_us()
+    else:
+        t_diff = ticks_diff(ticks_us(), first_edge)
+        
+    trap = not trap
+    
+    interrupt_channel.irq(handler = interrupt_handler)
+    
+    
+def busy_loops(run_ms):
+    # Spare CPU indicator: how many loop iterations fit into run_ms
+    n = 0
+    t0 = ticks_ms()
+    while(ticks_diff(ticks_ms(), t0) < run_ms):
+        n += 1
+    return n
+
+
+idle = busy_loops(RUN_MS)
+print("Idle loops: " + str(idle))
+
+
+for f_in in TEST_FREQUENCIES:
+    source.freq(f_in)
+    source.duty_u16(32768)
+    sleep_ms(50)
+    
+    if(f_in <= EXTI_MAX_HZ):
+        t_diff = 0
+        interrupt_channel.init(Pin.IN)
+        interrupt_channel.irq(trigger = Pin.IRQ_FALLING, handler = interrupt_handler)
+        loops = busy_loops(RUN_MS)
+        interrupt_channel.irq(handler = None)
+        if(t_diff > 0):
+            f_exti = 500000 / t_diff
+        else:
+            f_exti = 0
+        print("EXTI   f_in: %8u  f: %12.2f  CPU load: %5.1f %%" % (f_in, f_exti, (100 * (idle - loops)) / idle))
+    else:
+        print("EXTI   f_in: %8u  skipped" % f_in)
+    
+    meter = PWM_Counter(15, gate_ms = 100, divider = 1)
+    loops = busy_loops(RUN_MS)
+    f_pwm = meter.frequency()
+    meter.deinit()
+    print("PWM    f_in: %8u  f: %12.2f  CPU load: %5.1f %%" % (f_in, f_pwm, (100 * (idle - loops)) / idle))
+    
+    
+source.deinit()
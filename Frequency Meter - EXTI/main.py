@@ -1,6 +1,10 @@
 from machine import Pin, I2C
 from I2C_LCD import TWI_LCD
 from utime import sleep_ms, ticks_diff, ticks_us
+from PWM_Counter import PWM_Counter
+
+
+USE_PWM_COUNTER = True                  # False: time falling edges with the pin IRQ
 
 
 lcd_port = I2C(1, scl=Pin(3), sda=Pin(2), freq=20_000)
@@ -14,8 +18,6 @@ first_edge = 0
 second_edge = 0
 
 
-interrupt_channel = Pin(15, Pin.IN)
-
 def interrupt_handler(pin):
     global t_diff, trap, first_edge, second_edge
     
@@ -31,7 +33,11 @@ def interrupt_handler(pin):
     
     interrupt_channel.irq(handler = interrupt_handler)
     
-interrupt_channel.irq(trigger = Pin.IRQ_FALLING, handler = interrupt_handler)
+if(USE_PWM_COUNTER == True):
+    meter = PWM_Counter(15, gate_ms = 100, divider = 1)
+else:
+    interrupt_channel = Pin(15, Pin.IN)
+    interrupt_channel.irq(trigger = Pin.IRQ_FALLING, handler = interrupt_handler)
 
 
 lcd.clr_home
@@ -40,7 +46,11 @@ lcd.put_str("Frequency/Hz:")
 
 
 while True:    
-    f = (500000 / (t_diff))
+    if(USE_PWM_COUNTER == True):
+        f = meter.frequency()
+    elif(t_diff > 0):
+        f = (500000 / (t_diff))
+        
     print('F/Hz:' + str(f))
     lcd.goto_pos(0, 1)
     lcd.put_str(str("%4.2f            " % f))
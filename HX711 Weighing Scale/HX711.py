@@ -1,5 +1,15 @@
-from machine import Pin
+from machine import Pin, mem32, disable_irq, enable_irq
+from micropython import const
 from time import ticks_ms, sleep_ms
+from array import array
+
+
+# Total SCK pulses per read, the extra ones select the input for the NEXT conversion
+HX711_GAIN_A_128 = const(25)
+HX711_GAIN_B_32 = const(26)
+HX711_GAIN_A_64 = const(27)
+
+SIO_GPIO_IN = const(0xD0000004)
 
 
 class HX711:
@@ -94,4 +104,127 @@ class HX711:
     
 
     def power_up(self):
-        self.sck.value(0)
\ No newline at end of file
+        self.sck.value(0)
+
+
+class HX711_Multi:
+    
+    # Several HX711s on one shared SCK, read in parallel, cycling every chip through
+    # `schedule`. The gain/channel chosen by a read's trailing pulses applies to the
+    # next conversion, so each result is tagged with the setting sent one read earlier.
+    def __init__(self, _dout_pins, _sck_pin, _schedule = (HX711_GAIN_A_128, HX711_GAIN_B_32), _settle = 0, _callback = None):
+        self.douts = [Pin(p, Pin.IN, Pin.PULL_UP) for p in _dout_pins]
+        self.dout_pins = _dout_pins
+        self.ready_mask = 0
+        for p in _dout_pins:
+            self.ready_mask |= (1 << p)
+            
+        # Every switch drops the next _settle conversions, so each run of one gain in the
+        # (cyclic) schedule must be longer than that, or nothing would ever be delivered
+        if((_settle > 0) and (len(set(_schedule)) > 1) and (self.shortest_run(_schedule) < (_settle + 1))):
+            raise ValueError("With _settle > 0 each gain must repeat at least _settle + 1 times in a row")
+            
+        self.sck = Pin(_sck_pin, Pin.OUT)
+        self.schedule = _schedule
+        self.settle = _settle              # conversions dropped after a switch (datasheet: up to 4)
+        self.callback = _callback
+        
+        self.snapshots = array('I', [0] * 24)
+        self.samples = [{} for p in _dout_pins]
+        self.stamps = [{} for p in _dout_pins]
+        
+        self.slot = 0
+        self.discard = 0
+        self.reset()
+        
+        
+    def shortest_run(self, schedule):
+        n = len(schedule)
+        shortest = n
+        
+        for i in range(0, n):
+            if(schedule[i] != schedule[i - 1]):         # a run starts here
+                run = 1
+                while((run < n) and (schedule[(i + run) % n] == schedule[i])):
+                    run += 1
+                    
+                if(run < shortest):
+                    shortest = run
+                    
+        return shortest
+    
+    
+    def reset(self):
+        self.sck.value(1)
+        sleep_ms(1)
+        self.sck.value(0)
+        self.current = HX711_GAIN_A_128    # power-on default
+        self.slot = len(self.schedule) - 1
+        self.discard = self.settle
+        
+        
+    def ready(self):
+        return ((mem32[SIO_GPIO_IN] & self.ready_mask) == 0)
+    
+    
+    def poll(self):
+        # Non-blocking: returns False until every chip has a conversion waiting
+        if(self.ready() == False):
+            return False
+        
+        t = ticks_ms()
+        result_gain = self.current
+        
+        self.slot = (self.slot + 1) % len(self.schedule)
+        next_gain = self.schedule[self.slot]
+        
+        # SCK high for over 60us powers the chips down, keep interrupts out of the clocking
+        state = disable_irq()
+        for i in range(0, 24):
+            self.sck.value(1)
+            self.sck.value(0)
+            self.snapshots[i] = mem32[SIO_GPIO_IN]
+            
+        for i in range(24, next_gain):
+            self.sck.value(1)
+            self.sck.value(0)
+        enable_irq(state)
+        
+        # Conversions still settling after a switch are dropped, each run of a gain
+        # delivers its last (run - _settle) conversions
+        drop = (self.discard > 0)
+        if(drop):
+            self.discard -= 1
+            
+        if(next_gain != self.current):
+            self.current = next_gain
+            self.discard = self.settle
+            
+        if(drop):
+            return False
+        
+        for chip in range(0, len(self.dout_pins)):
+            value = 0
+            bit = self.dout_pins[chip]
+            
+            for i in range(0, 24):
+                value = (value << 1) | ((self.snapshots[i] >> bit) & 1)
+                
+            if(value & 0x800000):
+                value -= 0x1000000
+                
+            self.samples[chip][result_gain] = value
+            self.stamps[chip][result_gain] = t
+            
+            if(self.callback != None):
+                self.callback(chip, result_gain, value, t)
+                
+        return True
+    
+    
+    def get_sample(self, chip, gain):
+        # Latest (raw, ticks_ms) pair for one chip and input, or None if not seen yet
+        if(gain not in self.samples[chip]):
+            return None
+        
+        return self.samples[chip][gain], self.stamps[chip][gain]
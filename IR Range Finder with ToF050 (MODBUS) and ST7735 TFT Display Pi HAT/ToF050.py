@@ -1,6 +1,7 @@
 from micropython import const
 from machine import UART
 from utime import sleep_ms
+from CRC import crc16_modbus, check_crc16_modbus
 
 
 ToF050_TX_data_packet_size = const(8)
@@ -61,22 +62,7 @@ class ToF050():
         
         
     def generate_CRC16(self, value, length):
-        n = 0
-        s = 0
-        crc_word = 0xFFFF
-        
-        for s in range (0x00, length):
-            crc_word ^= value[s]
-            
-            for n in range (0x00, 0x08):
-                if((crc_word & 0x0001) == 0):
-                    crc_word >>= 1
-                
-                else:
-                    crc_word >>= 1
-                    crc_word ^= 0xA001
-        
-        return crc_word
+        return crc16_modbus(value, 0, length)
     
     
     def check_crc(self, value, s, e):
@@ -121,20 +107,18 @@ class ToF050():
             
             
     def get_range(self):
-        crc_1 = 0x0000
-        crc_2 = 0xFFFF
         range = -1        
         
         self.MODBUS_TX(self.tof_slave_address, MODBUS_read_holding_registers_function_code, ToF050_measurement_register, 0x0001)
         self.MODBUS_RX(0x07)
+        
+        if(len(self.rx_data_frame) < 0x07):
+            return range
                 
         if(self.rx_data_frame[0x00] == 0x01):
             if(self.rx_data_frame[0x01] == 0x03):
                 if(self.rx_data_frame[0x02] == 0x02):
-                    crc_1 = self.generate_CRC16(self.rx_data_frame, 5)
-                    crc_2 = self.check_crc(self.rx_data_frame, 5, 6)
-                    
-                    if(crc_1 == crc_2):
+                    if(check_crc16_modbus(self.rx_data_frame, 5)):
                         range = self.rx_data_frame[3]
                         range <<= 0x08
                         range |= self.rx_data_frame[4]
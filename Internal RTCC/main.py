@@ -1,9 +1,23 @@
-from machine import Pin, RTC
+from machine import Pin, RTC, Timer, idle
+from micropython import const
 from ST7735 import TFT096
-from utime import sleep_ms 
+from utime import ticks_ms, ticks_diff
+from collections import deque
 import math
 
 
+DEBOUNCE_MS = const(50)
+
+EVENT_TICK = const(0)
+EVENT_UP = const(1)
+EVENT_DOWN = const(2)
+EVENT_LEFT = const(3)
+EVENT_RIGHT = const(4)
+EVENT_CENTER = const(5)
+EVENT_A = const(6)
+EVENT_B = const(7)
+
+
 UP_key = Pin(2, Pin.IN, Pin.PULL_UP)
 DOWN_key = Pin(18, Pin.IN, Pin.PULL_UP)
 LEFT_key = Pin(16, Pin.IN, Pin.PULL_UP)
@@ -38,22 +52,51 @@ min_hand_colour =  (lcd.GREEN, lcd.MAGENTA, lcd.CYAN, lcd.YELLOW, lcd.RED, lcd.B
 sec_hand_colour =  (lcd.MAGENTA, lcd.CYAN, lcd.YELLOW, lcd.RED, lcd.BLUE, lcd.GREEN, )
 
 
+set_labels = ("Set Hour", "Set Min", "Set Sec", "Set Date", "Set Month", "Set Year")
+
+events = deque((), 16)
+last_press = {}
+tick_timer = Timer()
+
+
 rtc_val = (year, month, date, day, hour, minute, second, time_zone)
 rtc.datetime(rtc_val)
 
 
-def set_parameter(value, value_max, value_min):
-    if(UP_key.value() == False):
+def post_tick(timer):
+    events.append(EVENT_TICK)
+
+
+def key_handler(event):
+    def handler(pin):
+        # Debounce in the IRQ: ignore edges closer than DEBOUNCE_MS to the last accepted one
+        now = ticks_ms()
+        if(ticks_diff(now, last_press.get(event, (now - DEBOUNCE_MS))) >= DEBOUNCE_MS):
+            last_press[event] = now
+            events.append(event)
+    return handler
+
+
+def start_tick():
+    # Align the 1 Hz timer with the RTC second rollover so redraws land on it
+    tick_timer.deinit()
+    s = rtc.datetime()[6]
+    while(rtc.datetime()[6] == s):
+        pass
+    tick_timer.init(mode = Timer.PERIODIC, period = 1000, callback = post_tick)
+    events.append(EVENT_TICK)
+
+
+def set_parameter(value, value_max, value_min, event):
+    if(event == EVENT_UP):
         LED.toggle()
-        sleep_ms(30)
         value += 1
         
     if(value > value_max):
         value = value_min
         
-    if(DOWN_key.value() == False):
+    if(event == EVENT_DOWN):
         LED.toggle()
-        sleep_ms(30)
         value -= 1
         
     if(value < value_min):
@@ -62,34 +105,24 @@ def set_parameter(value, value_max, value_min):
     return value 
 
 
-def select_mode():
+def select_mode(event):
     global set_read, i, j
     
-    if(A_key.value() == False):
-        sleep_ms(60)
-        if(A_key.value() == False):
-            set_read = 1
+    if(event == EVENT_A):
+        set_read = 1
     
-    if(set_read == 1):
-        set_time()    
-    elif(set_read == 0):
-        read_time()
-        
-    if(B_key.value() == False):
-        sleep_ms(60)
-        if(B_key.value() == False):
-            i += 1
-            
-    if(i >= 6 ):
-        i = 0
-        
-    if(CENTER_key.value() == False):
-        sleep_ms(60)
-        if(CENTER_key.value() == False):
-            j += 1
+    elif(event == EVENT_B):
+        i += 1
+        if(i >= 6 ):
+            i = 0
             
-    if(j >= 6 ):
-        j = 0
+    elif(event == EVENT_CENTER):
+        j += 1
+        if(j >= 6 ):
+            j = 0
+    
+    elif(set_read == 1):
+        set_time(event)
 
 
 def read_time():
@@ -105,55 +138,44 @@ def read_time():
     second = rtc_val[6]
     
     LED.toggle()
-    sleep_ms(990)
     
     
-def set_time():
+def set_time(event):
     global year, month, date, hour, minute, second, rtc_val, index, set_read
    
     print(index)
     print("\r\n")
    
-    if(RIGHT_key.value() == False):
-        sleep_ms(40)
+    if(event == EVENT_RIGHT):
         index += 1
         
     if(index > 6):
         index = 6
         
-    if(LEFT_key.value() == False):
-        sleep_ms(40)
+    if(event == EVENT_LEFT):
         index -= 1
         
     if(index < 0):
         index = 0
     
     if(index == 0):
-        lcd.text("Set Hour", 86, 72, lcd.MAGENTA)
-        hour = set_parameter(hour, 23, 0)
+        hour = set_parameter(hour, 23, 0, event)
     elif(index == 1):
-        lcd.text("Set Min", 86, 72, lcd.MAGENTA)
-        minute = set_parameter(minute, 59, 0)
+        minute = set_parameter(minute, 59, 0, event)
     elif(index == 2):
-        lcd.text("Set Sec", 86, 72, lcd.MAGENTA)
-        second = set_parameter(second, 59, 0)
+        second = set_parameter(second, 59, 0, event)
     elif(index == 3):
-        lcd.text("Set Date", 86, 72, lcd.MAGENTA)
-        date = set_parameter(date, 31, 1)
+        date = set_parameter(date, 31, 1, event)
     elif(index == 4):
-        lcd.text("Set Month", 86, 72, lcd.MAGENTA)
-        month = set_parameter(month, 12, 1)
+        month = set_parameter(month, 12, 1, event)
     elif(index == 5):
-        lcd.text("Set Year", 86, 72, lcd.MAGENTA)
-        year = set_parameter(year, 2099, 1970)
+        year = set_parameter(year, 2099, 1970, event)
     elif(index == 6):
         rtc_val = (year, month, date, day, hour, minute, second, time_zone)
         rtc.datetime(rtc_val)
-        lcd.text("            ", 86, 72, lcd.BLACK)
         set_read = 0
         index = 0
-    
-    sleep_ms(100)
+        start_tick()
 
 
 def analog_clock():
@@ -192,14 +214,40 @@ def serial_clock():
     print(str("%02u" % date) + "/" + str("%02u" % month) + ":" + str("%04u" % year) + "\r\n")
 
 
-while True:
+def redraw():
     analog_clock()
-    digital_clock()    
-    serial_clock()
-    select_mode()
-    lcd.display()
+    digital_clock()
     
+    if(set_read == 1):
+        lcd.text(set_labels[index], 86, 72, lcd.MAGENTA)
+        
+    lcd.display()
 
 
+UP_key.irq(trigger = Pin.IRQ_FALLING, handler = key_handler(EVENT_UP))
+DOWN_key.irq(trigger = Pin.IRQ_FALLING, handler = key_handler(EVENT_DOWN))
+LEFT_key.irq(trigger = Pin.IRQ_FALLING, handler = key_handler(EVENT_LEFT))
+RIGHT_key.irq(trigger = Pin.IRQ_FALLING, handler = key_handler(EVENT_RIGHT))
+CENTER_key.irq(trigger = Pin.IRQ_FALLING, handler = key_handler(EVENT_CENTER))
+A_key.irq(trigger = Pin.IRQ_FALLING, handler = key_handler(EVENT_A))
+B_key.irq(trigger = Pin.IRQ_FALLING, handler = key_handler(EVENT_B))
 
+start_tick()
 
+
+while True:
+    if(len(events) == 0):
+        idle()
+        continue
+    
+    event = events.popleft()
+    
+    if(event == EVENT_TICK):
+        # While setting, the edited values must not be overwritten by the RTC
+        if(set_read == 0):
+            read_time()
+            serial_clock()
+    else:
+        select_mode(event)
+        
+    redraw()
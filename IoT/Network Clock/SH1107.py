@@ -63,6 +63,7 @@ class OLED_13(framebuf.FrameBuffer):
         self.dc(HIGH)
         
         self.buffer = bytearray(self.height * (self.width // 8))
+        self.bg_buffer = bytearray(len(self.buffer))
         super().__init__(self.buffer, self.width, self.height, framebuf.MONO_HMSB)
         self.init_display()
         
@@ -130,3 +131,12 @@ class OLED_13(framebuf.FrameBuffer):
             for num in range(0, 16):
                 self.write((self.buffer[(page * 16) + num]), DAT)
 
+
+    def save_background(self):
+        # Retain the current frame as the static background layer
+        self.bg_buffer[:] = self.buffer
+        
+        
+    def restore_background(self):
+        # Start a new frame from the retained layer instead of redrawing the artwork
+        self.buffer[:] = self.bg_buffer
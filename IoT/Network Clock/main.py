@@ -1,5 +1,5 @@
 from machine import Pin
-from utime import sleep_ms
+from utime import sleep_ms, ticks_us, ticks_diff
 from WiFi import wifi
 from SH1107 import OLED_13
 import WiFi_Credentials
@@ -8,6 +8,9 @@ import math
 import ujson
 
 
+SHOW_FRAME_TIME = False         # True prints how long each frame takes to build, in us
+
+
 sync_hour = const(3)
 
 i = 0
@@ -89,12 +92,16 @@ def digital_clock():
     oled.text(".", 89, 30, oled.WHITE)
     oled.text(str("%04u" % year), 96, 30, oled.WHITE)
     
+    
+def print_clock():
     print("Time: " + str("%02u" % hour) + ":" + str("%02u" % minute) + ":" + str("%02u" % second))
     print("Date: " + str("%02u" % date) + "." + str("%02u" % month) + "." + str("%04u" % year) + "\r\n")
 
 
 oled.fill(oled.BLACK)
 oled.show()
+background()
+oled.save_background()
 
 
 while(True):
@@ -140,9 +147,18 @@ while(True):
                 
             time_fetch_flag = False
             
-    background()
+    t0 = ticks_us()
+    oled.restore_background()
     analogue_clock()
     digital_clock()
+    build_us = ticks_diff(ticks_us(), t0)
+    
+    # Serial output stays outside the timed section, it would swamp the frame build time
+    print_clock()
+    
+    if(SHOW_FRAME_TIME):
+        print("Frame build/us: " + str(build_us))
+        
     year, month, date, hour, minute, second, weekday, yearday = time.localtime()
     oled.show()
     LED.toggle()
@@ -1,46 +1,164 @@
 from machine import Pin
+from micropython import const
+from rp2 import asm_pio, asm_pio_encode, StateMachine, PIO
+from utime import ticks_us, ticks_diff
 
 
-class encoder():
+QUAD_SM_FREQ = const(10000000)          # ~4 cycles per poll, each state checked every 0.5us
+QUAD_POSITION_BIAS = const(0x40000000)  # keeps x away from 0 and from its own inverse
+
+
+class quad_encoder():
     
-    def __init__(self, enc_A, enc_B, _sw, _min_cnt,  _max_cnt, _step_size):
-        self.sw = Pin(_sw, Pin.IN)
-        self.enc_a = Pin(enc_A, Pin.IN)
-        self.enc_b = Pin(enc_B, Pin.IN)
-        self.max_cnt = _max_cnt
-        self.min_cnt = _min_cnt
-        self.step_size = _step_size
-        self.cnt = self.min_cnt
+    # One block per quadrature state, the program counter remembers the old state and
+    # x holds the position. Counting up is invert/decrement/invert, counting down is a
+    # plain decrement. The program fills all 32 instructions of its PIO block.
+    @asm_pio(out_shiftdir = PIO.SHIFT_RIGHT)
+    def IO_ops():
+        wrap_target()
+        label("s00")                # A = 0, B = 0
+        jmp(pin, "s00_up")          # A rose: up
+        mov(osr, pins)
+        out(y, 1)                   # y = B
+        jmp(not_y, "s00")
+        jmp(x_dec, "s01")           # B rose: down
+        label("s00_up")
+        mov(x, invert(x))
+        jmp(x_dec, "s00_up2")
+        label("s00_up2")
+        mov(x, invert(x))
+        
+        label("s10")                # A = 1, B = 0
+        mov(osr, pins)
+        out(y, 1)
+        jmp(not_y, "s10_a")
+        mov(x, invert(x))           # B rose: up
+        jmp(x_dec, "s10_up2")
+        label("s10_up2")
+        mov(x, invert(x))
+        
+        label("s11")                # A = 1, B = 1
+        jmp(pin, "s11_b")
+        mov(x, invert(x))           # A fell: up
+        jmp(x_dec, "s11_up2")
+        label("s11_up2")
+        mov(x, invert(x))
+        
+        label("s01")                # A = 0, B = 1
+        jmp(pin, "s01_down")        # A rose: down
+        mov(osr, pins)
+        out(y, 1)
+        jmp(y_dec, "s01")
+        mov(x, invert(x))           # B fell: up
+        jmp(x_dec, "s01_up2")
+        label("s01_up2")
+        mov(x, invert(x))
+        wrap()
+        
+        label("s10_a")
+        jmp(pin, "s10")
+        jmp(x_dec, "s00")           # A fell: down
         
+        label("s11_b")
+        mov(osr, pins)
+        out(y, 1)
+        jmp(y_dec, "s11")
+        jmp(x_dec, "s10")           # B fell: down
         
-    def check_count(self):
-        if self.enc_a.value():
-            self.cnt += self.step_size
+        label("s01_down")
+        jmp(x_dec, "s11")
+        
+        
+    def __init__(self, _enc_A, _enc_B, _sm = 0):
+        self.enc_a = Pin(_enc_A, Pin.IN, Pin.PULL_UP)
+        self.enc_b = Pin(_enc_B, Pin.IN, Pin.PULL_UP)
+        
+        self.read_x = asm_pio_encode("mov(isr, x)", 0)
+        self.push_x = asm_pio_encode("push(noblock)", 0)
+        
+        self.sm = StateMachine(_sm, quad_encoder.IO_ops, freq = QUAD_SM_FREQ, in_base = self.enc_b, jmp_pin = self.enc_a)
+        
+        self.sm.put(QUAD_POSITION_BIAS)
+        self.sm.exec("pull()")
+        self.sm.exec("mov(x, osr)")
+        self.sm.active(1)
+        
+        self.zero = 0
+        self.zero = self.raw_position()     # the program starts in s00, drop its catch-up counts
+        
+        self.last_position = 0
+        self.last_us = ticks_us()
+        self.speed = 0
+        
+        
+    def raw_position(self):
+        while(self.sm.rx_fifo() > 0):
+            self.sm.get()
             
-            if(self.cnt > self.max_cnt):
-                self.cnt = self.min_cnt
-                
-        else:
-            self.cnt -= self.step_size
+        self.sm.exec(self.read_x)
+        self.sm.exec(self.push_x)
+        value = self.sm.get()
+        
+        # Caught in the middle of an up count x is inverted, which the bias makes visible
+        if(value & 0x80000000):
+            value = (~value) & 0xFFFFFFFF
             
-            if(self.cnt < self.min_cnt):
-                self.cnt = self.max_cnt
+        return (value - QUAD_POSITION_BIAS)
+    
     
+    def position(self):
+        return (self.raw_position() - self.zero)
     
-    def irq_handler_1(self, p):
-        self.check_count()
+    
+    def reset(self, value = 0):
+        self.zero = self.raw_position() - value
+        self.last_position = value
+        
+        
+    def velocity(self):
+        # Counts per second since the previous call
+        now = ticks_us()
+        position = self.position()
+        dt = ticks_diff(now, self.last_us)
+        
+        if(dt > 0):
+            self.speed = ((position - self.last_position) * 1000000) // dt
+            
+        self.last_position = position
+        self.last_us = now
+        
+        return self.speed
+    
+    
+    def stop(self):
+        self.sm.active(0)
 
 
-    def irq_handler_2(self, p):
-        self.check_count()
-            
-            
+class encoder():
+    
+    def __init__(self, enc_A, enc_B, _sw, _min_cnt,  _max_cnt, _step_size, _counts_per_step = 4, _sm = 0):
+        self.sw = Pin(_sw, Pin.IN)
+        self.quad = quad_encoder(enc_A, enc_B, _sm)
+        self.max_cnt = _max_cnt
+        self.min_cnt = _min_cnt
+        self.step_size = _step_size
+        self.counts_per_step = _counts_per_step
+        self.cnt = self.min_cnt
+        self.last_steps = 0
+        
+        
     def decode(self):
-        if ((self.enc_a.value() == True) and (self.enc_b.value() == True)):
-            self.enc_b.irq(self.irq_handler_1, Pin.IRQ_FALLING)
+        steps = self.quad.position() // self.counts_per_step
+        
+        self.cnt += (steps - self.last_steps) * self.step_size
+        self.last_steps = steps
+        
+        span = (self.max_cnt - self.min_cnt) + self.step_size
         
-        if ((self.enc_a.value() == False) and (self.enc_b.value() == False)):
-            self.enc_b.irq(self.irq_handler_2, Pin.IRQ_RISING)
+        if(self.cnt > self.max_cnt):
+            self.cnt -= span
+                
+        elif(self.cnt < self.min_cnt):
+            self.cnt += span
             
         return self.cnt
-                
@@ -0,0 +1,119 @@
+from micropython import const
+from array import array
+import micropython
+import math
+from ADC_DMA import ADC_Sampler
+
+
+SAMPLE_RATE = const(10000)
+BLOCK_SIZE = const(256)                 # 25.6 ms per frame, 39 Hz bin spacing
+COEFF_SHIFT = const(12)
+
+VOLTS_PER_COUNT = 3.3 / 4096.0
+
+BAND_CENTRES = (80, 160, 310, 630, 1250, 2000, 3000, 4300)
+
+
+@micropython.viper
+def block_sum(buf: ptr16, n: int) -> int:
+    total = 0
+    for i in range(n):
+        total += int(buf[i])
+    return total
+
+
+@micropython.viper
+def block_sum_sq(buf: ptr16, n: int, mean: int) -> int:
+    total = 0
+    for i in range(n):
+        x = int(buf[i]) - mean
+        total += (x * x)
+    return total
+
+
+@micropython.viper
+def goertzel(buf: ptr16, n: int, mean: int, state: ptr32):
+    # Viper takes at most 4 arguments, so state carries [coeff, shift] in and [s1, s2] out
+    coeff = state[0]
+    shift = state[1]
+    s1 = 0
+    s2 = 0
+    for i in range(n):
+        s0 = ((int(buf[i]) - mean) >> shift) + ((coeff * s1) >> 12) - s2
+        s2 = s1
+        s1 = s0
+    state[0] = s1
+    state[1] = s2
+
+
+class SPL_Meter(ADC_Sampler):
+    
+    # Fixed rate microphone capture on top of the DMA sampler: every block is copied out
+    # in the IRQ and update() turns it into a DC-free RMS level and Goertzel band levels
+    def __init__(self, channel = 0, rate = SAMPLE_RATE, block = BLOCK_SIZE, bands = BAND_CENTRES):
+        self.work = array('H', [0] * block)
+        self.fresh = False
+        
+        self.coeffs = []
+        self.shifts = []
+        for f in bands:
+            k = int((f * block / rate) + 0.5)
+            w = (2.0 * math.pi * k) / block
+            self.coeffs.append(int(2.0 * math.cos(w) * (1 << COEFF_SHIFT)))
+            
+            # The resonator peaks near n * x / (2 * sin(w)), scale the input so that
+            # times a Q12 coefficient it stays inside 32 bits
+            shift = 1
+            while((1 << shift) < (block * 2048) / ((1 << 17) * math.sin(w))):
+                shift += 1
+            self.shifts.append(shift)
+            
+        self.state = array('i', [0, 0])
+        self.band_dB = [0.0] * len(bands)
+        self.rms = 0.0
+        self.dB = 0.0
+        self.spectrum = False
+        
+        super().__init__([channel], rate, block)
+        
+        
+    def process(self, buf):
+        self.work[:] = buf
+        self.fresh = True
+        self.blocks += 1
+        
+        
+    def update(self):
+        # Non-blocking, returns True once per captured block
+        if(self.fresh == False):
+            return False
+        
+        self.fresh = False
+        n = self.decimation
+        
+        mean = block_sum(self.work, n) // n
+        self.rms = math.sqrt(block_sum_sq(self.work, n, mean) / n) * VOLTS_PER_COUNT
+        
+        if(self.rms <= VOLTS_PER_COUNT):
+            self.rms = VOLTS_PER_COUNT
+            
+        self.dB = 94 + (20 * math.log10(self.rms / 3.16))
+        
+        if(self.spectrum):
+            for i in range(0, len(self.coeffs)):
+                c = self.coeffs[i]
+                self.state[0] = c
+                self.state[1] = self.shifts[i]
+                goertzel(self.work, n, mean, self.state)
+                s1 = self.state[0]
+                s2 = self.state[1]
+                
+                power = (s1 * s1) + (s2 * s2) - ((c * s1 * s2) >> COEFF_SHIFT)
+                if(power < 1):
+                    power = 1
+                
+                # Undo the input shift and the n / 2 Goertzel gain to get peak counts
+                amplitude = (((2 << self.shifts[i]) * math.sqrt(power)) / n) * VOLTS_PER_COUNT
+                self.band_dB[i] = 94 + (20 * math.log10(amplitude / (3.16 * 1.41421)))
+                
+        return True
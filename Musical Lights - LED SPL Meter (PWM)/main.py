@@ -1,18 +1,17 @@
-from machine import Pin, PWM, ADC
-from utime import sleep_ms, sleep_us
-import math
+from micropython import const
+from machine import Pin, PWM
+from SPL_Meter import SPL_Meter
+from LED_Bank import LED_Bank
 
 
-adc = ADC(Pin(26))
+SPECTRUM = False                # True: one LED per frequency band instead of the dB bar
+BAND_THRESHOLD_DB = const(45)
 
-D0 = Pin(1, Pin.OUT)
-D1 = Pin(3, Pin.OUT)
-D2 = Pin(5, Pin.OUT)
-D3 = Pin(6, Pin.OUT)
-D4 = Pin(7, Pin.OUT)
-D5 = Pin(8, Pin.OUT)
-D6 = Pin(9, Pin.OUT)
-D7 = Pin(10, Pin.OUT)
+
+meter = SPL_Meter(0)
+meter.spectrum = SPECTRUM
+
+leds = LED_Bank([1, 3, 5, 6, 7, 8, 9, 10], active_low = True)
 
 pwm1 = PWM(Pin(0))
 pwm1.freq(6000)
@@ -31,127 +30,56 @@ def map_value(v, x_min, x_max, y_min, y_max):
     return int(y_min + (((y_max - y_min)/(x_max - x_min)) * (v - x_min)))
 
 
+# level(v) lights the top v LEDs, anything outside 1..8 blanks the bar
+levels = leds.compile([0] + [((0xFF << (8 - v)) & 0xFF) for v in range(1, 9)])
+
+
 def level(value):
-    if(value == 8):
-        D0.low()
-        D1.low()
-        D2.low()
-        D3.low()
-        D4.low()
-        D5.low()
-        D6.low()
-        D7.low()
-    
-    elif(value == 7):
-        D0.high()
-        D1.low()
-        D2.low()
-        D3.low()
-        D4.low()
-        D5.low()
-        D6.low()
-        D7.low()
-        
-    elif(value == 6):
-        D0.high()
-        D1.high()
-        D2.low()
-        D3.low()
-        D4.low()
-        D5.low()
-        D6.low()
-        D7.low()
+    if((value < 1) or (value > 8)):
+        value = 0
         
-    elif(value == 5):
-        D0.high()
-        D1.high()
-        D2.high()
-        D3.low()
-        D4.low()
-        D5.low()
-        D6.low()
-        D7.low()
-        
-    elif(value == 4):
-        D0.high()
-        D1.high()
-        D2.high()
-        D3.high()
-        D4.low()
-        D5.low()
-        D6.low()
-        D7.low()
-        
-    elif(value == 3):
-        D0.high()
-        D1.high()
-        D2.high()
-        D3.high()
-        D4.high()
-        D5.low()
-        D6.low()
-        D7.low()
-        
-    elif(value == 2):
-        D0.high()
-        D1.high()
-        D2.high()
-        D3.high()
-        D4.high()
-        D5.high()
-        D6.low()
-        D7.low()
-        
-    elif(value == 1):
-        D0.high()
-        D1.high()
-        D2.high()
-        D3.high()
-        D4.high()
-        D5.high()
-        D6.high()
-        D7.low()
-        
-    else:
-        D0.high()
-        D1.high()
-        D2.high()
-        D3.high()
-        D4.high()
-        D5.high()
-        D6.high()
-        D7.high()
+    leds.show(levels[value])
         
         
-def ADC_rms():
-    rms = 0
-    tmp = 0
-    sample = 0
+def bands(band_levels):
+    # One LED per Goertzel band
+    bits = 0
     
-    for i in range(0, 16):
-        sample = adc.read_u16()
-        tmp += (sample * sample)
-        
-    tmp >>= 4
-    rms = math.sqrt(tmp)
-    rms *= 0.000050354
-    
-    if(rms <= 0):
-        rms = 0.000050354
-        
-    return rms
+    for i in range(0, 8):
+        if(band_levels[i] >= BAND_THRESHOLD_DB):
+            bits |= (1 << i)
+            
+    leds.show_bits(bits)
 
 
-def get_dB():
-    dB = ADC_rms()
-    dB  = 94 + (20 * math.log10(dB / 3.16))
-    return dB
+def band_duty(value):
+    value = map_value(value, BAND_THRESHOLD_DB, 90, 64000, 40)
+    
+    if(value > 64000):
+        value = 64000
+        
+    if(value < 40):
+        value = 40
+        
+    return value
         
         
 while(True):
-    db = get_dB()
+    if(meter.update() == False):
+        continue
+    
+    db = meter.dB
     print(db)
     
+    if(SPECTRUM):
+        bands(meter.band_dB)
+        
+        # Bass, mid and treble drive the three PWM channels
+        pwm1.duty_u16(band_duty(max(meter.band_dB[0], meter.band_dB[1])))
+        pwm2.duty_u16(band_duty(max(meter.band_dB[3], meter.band_dB[4])))
+        pwm3.duty_u16(band_duty(max(meter.band_dB[6], meter.band_dB[7])))
+        continue
+    
     if((db >= 30) and (db <= 55)):
         pwm1.duty_u16(64000)
         pwm2.duty_u16(40)
@@ -169,7 +97,3 @@ while(True):
         
     i = map_value(db, 40, 90, 1, 8)
     level(i)
-    sleep_ms(40)
-  
-
-
@@ -1,5 +1,6 @@
 from micropython import const
 from machine import I2C
+from utime import ticks_ms, ticks_diff
 
 
 CONFIG_REG = const(0x00)
@@ -39,10 +40,15 @@ shunt_voltage_continuous_mode = const(0x05)
 bus_voltage_continuous_mode = const(0x06)
 shunt_and_bus_voltage_continuous_mode = const(0x07)
 
+conversion_ready_flag = const(0x02)
+
+full_charge_taper_mA = const(50)        # charging current at which the cell counts as full
+save_interval_ms = const(60000)         # flash writes are rationed to once a minute
+
 
 class INA219():
 
-    def __init__(self, _i2c, _i2c_addr, _shunt, _batt_low, _batt_full):
+    def __init__(self, _i2c, _i2c_addr, _shunt, _batt_low, _batt_full, _capacity_mAh = 1000, _state_file = "battery.dat"):
         self.i2c = _i2c
         self.i2c_addr = _i2c_addr
         self.batt_low = _batt_low
@@ -51,18 +57,32 @@ class INA219():
         self.calibration_value = 0
         self.power_lsb = 0
         self.shunt_resistor_ohms = _shunt
+        self.buffer = bytearray(2)
+        
+        self.bus_voltage = 0.0
+        self.current = 0.0
+        self.power = 0.0
+        self.discharge_mA = 0.0
+        
+        self.capacity_mAh = _capacity_mAh
+        self.charge_mAh = -1
+        self.state_file = _state_file
+        self.last_update = ticks_ms()
+        self.last_save = self.last_update
+        
         self.calibrate_for_32V_2A()
+        self.load_state()
 
 
     def read(self, reg):
-        value = self.i2c.readfrom_mem(self.i2c_addr, reg, 0x02)
-        retval = ((value[0x00] << 0x08) + value[0x01])
+        self.i2c.readfrom_mem_into(self.i2c_addr, reg, self.buffer)
+        retval = ((self.buffer[0x00] << 0x08) + self.buffer[0x01])
         return retval
 
 
     def write(self, reg, value):
         if not type(value) is bytearray:
-            value = bytearray([value])
+            value = bytearray([((value >> 0x08) & 0xFF), (value & 0xFF)])
         
         self.i2c.writeto_mem(self.i2c_addr, reg, value)
         
@@ -136,4 +156,92 @@ class INA219():
         if(capacity <= 0):
             capacity = 0
         
-        return capacity 
+        return capacity
+    
+    
+    def measure(self):
+        # The pointer register does not auto-increment, so a burst is three back to back
+        # reads of one conversion: bus (with the ready flag), power and current.
+        # Reading POWER clears the flag, returns False if nothing new has been averaged.
+        value = self.read(BUS_VOLTAGE_REG)
+        
+        if((value & conversion_ready_flag) == 0):
+            return False
+        
+        self.bus_voltage = ((value >> 3) * 0.004)
+        
+        value = self.read(POWER_REG)
+        self.power = (value * self.power_lsb * 10.0)
+        
+        value = self.read(CURRENT_REG)
+        if(value > 32767):
+            value -= 65536
+        self.current = (value * self.current_lsb)
+        
+        return True
+    
+    
+    def update(self):
+        # Call often, integrates current (negative while discharging) into mAh
+        if(self.measure() == False):
+            return False
+        
+        now = ticks_ms()
+        dt = ticks_diff(now, self.last_update)
+        self.last_update = now
+        
+        self.charge_mAh += ((self.current * dt) / 3600000.0)
+        
+        if((self.bus_voltage >= self.batt_full) and (0 <= self.current < full_charge_taper_mA)):
+            self.charge_mAh = self.capacity_mAh
+            
+        if(self.charge_mAh > self.capacity_mAh):
+            self.charge_mAh = self.capacity_mAh
+            
+        if((self.bus_voltage <= self.batt_low) or (self.charge_mAh < 0)):
+            self.charge_mAh = 0
+        
+        if(self.current < 0):
+            self.discharge_mA += (((-self.current) - self.discharge_mA) * 0.05)
+        else:
+            self.discharge_mA = 0.0
+        
+        if(ticks_diff(now, self.last_save) >= save_interval_ms):
+            self.save_state()
+            
+        return True
+    
+    
+    def get_state_of_charge(self):
+        return ((self.charge_mAh * 100.0) / self.capacity_mAh)
+    
+    
+    def get_time_to_empty(self):
+        # Minutes left at the smoothed discharge current, -1 while charging or idle
+        if(self.discharge_mA < 1.0):
+            return -1
+        
+        return ((self.charge_mAh * 60.0) / self.discharge_mA)
+    
+    
+    def mark_full(self):
+        self.charge_mAh = self.capacity_mAh
+        self.save_state()
+    
+    
+    def load_state(self):
+        try:
+            with open(self.state_file, "r") as f:
+                self.charge_mAh = float(f.read())
+        except (OSError, ValueError):
+            self.charge_mAh = ((self.get_battery_capacity() * self.capacity_mAh) / 100.0)
+    
+    
+    def save_state(self):
+        self.last_save = ticks_ms()
+        
+        try:
+            with open(self.state_file, "w") as f:
+                f.write("{:.2f}".format(self.charge_mAh))
+        except OSError:
+            pass
@@ -1,9 +1,12 @@
 from machine import Pin, I2C
-from utime import sleep_ms
+from utime import sleep_ms, ticks_us, ticks_diff
 from ST7789 import TFT2
 from INA219 import INA219
 
 
+SHOW_FRAME_TIME = False         # True prints how long each frame takes to build, in us
+
+
 key1 = Pin(15, Pin.IN, Pin.PULL_UP)
 key2 = Pin(17, Pin.IN, Pin.PULL_UP)
 LED = Pin(25, Pin.OUT)
@@ -13,7 +16,6 @@ tft = TFT2()
 
 
 state_1 = False
-state_2 = False
 
 
 def map_value(v, x_min, x_max, y_min, y_max):
@@ -30,13 +32,23 @@ def constrain_value(v, max_v, min_v):
     return v
 
 
-def back_art(value):
+def static_art():
     tft.fill(tft.BLACK)
     tft.text("Raspberry Pi PICO RP2040 UPS" , 40, 20, tft.WHITE)
     
     tft.fill_rect(20, 50, 30, 10, tft.WHITE)
     tft.rect(10, 60, 50, 170, tft.WHITE)
     tft.rect(12, 62, 46, 166, tft.WHITE)
+    tft.text("Battery Parameters" , 110, 55, tft.MAGENTA)
+    
+    # A full 320x240 copy does not fit next to the frame buffer in RAM,
+    # so only the regions redrawn every frame are retained and restored
+    tft.save_background(14, 64, 42, 162)
+    tft.save_background(110, 80, 200, 100)
+
+
+def back_art(value):
+    tft.restore_background()
     
     h1 = map_value(value, 0, 100, 225, 65)
     h2 = map_value(value, 0, 100, 0, 160)
@@ -54,6 +66,9 @@ def back_art(value):
     tft.fill_rect(15, h1, 40, h2, colour)
     
     
+static_art()
+
+
 for i in range(0, 100, 5):
     back_art(i)
     tft.show()
@@ -77,31 +92,32 @@ while (True):
         LED.on()
         while(key2.value() == False):
             pass
-        state_2 ^= 1
+        ina.mark_full()
         LED.off()
      
  
-    bv = (ina.get_bus_voltage_in_mV() / 1000.0)        
-    c = ina.get_battery_capacity()
+    ina.update()
     
-    if(state_1):
-        i = ina.get_current_mA()
-    else:
-        i = ina.get_current_from_shunt()
-        
-        
-    if(state_2):
-        p = ina.get_power()
-    else:
-        p = ina.calculate_power()
+    bv = ina.bus_voltage
+    i = ina.current
+    p = ina.power
+    c = ina.get_state_of_charge()
     
+    t0 = ticks_us()
     back_art(c)
     
-    tft.text("Battery Parameters" , 110, 55, tft.MAGENTA)
     tft.text(("Voltage : " + str("%1.3f" %bv) + " V"), 110, 80, tft.CYAN)
     tft.text(("Current : " + str("%4.1f" %i) + " mA"), 110, 110, tft.GREEN)
     tft.text(("Power   : " + str("%3.2f" %p) + " W"), 110, 140, tft.RED)
-    tft.text(("Capacity: " + str("%3.1f" %c) + " %"), 110, 170, tft.YELLOW)
+    if(state_1):
+        tte = ina.get_time_to_empty()
+        if(tte < 0):
+            tft.text("Runtime : --", 110, 170, tft.YELLOW)
+        else:
+            tft.text(("Runtime : " + str("%d" %(tte // 60)) + " h " + str("%02d" %(tte % 60)) + " min"), 110, 170, tft.YELLOW)
+    else:
+        tft.text(("Capacity: " + str("%3.1f" %c) + " %"), 110, 170, tft.YELLOW)
+    build_us = ticks_diff(ticks_us(), t0)
     
     tft.show()
     
@@ -109,6 +125,11 @@ while (True):
     print("Current :  {:4.1f} mA".format(i))
     print("Power   :  {:3.2f} W".format(p))
     print("Capacity:  {:3.1f} %".format(c))
+    print("Runtime :  {:.0f} min".format(ina.get_time_to_empty()))
+    
+    if(SHOW_FRAME_TIME):
+        print("Frame build/us: " + str(build_us))
+        
     print("\r\n")
     
     sleep_ms(100)
@@ -1,37 +1,51 @@
 from micropython import const
 from machine import Pin
-from utime import sleep_ms
+from utime import ticks_ms, ticks_diff, ticks_add
 from rp2 import PIO, asm_pio, StateMachine
 
 
 DHT11_sensor = const(0)
 DHT2x_sensor = const(1)
 
+DHT_SM_FREQ = const(500000)
+DHT_NUM_SM = const(8)
+DHT_FRAME_BYTES = const(5)
+DHT_TIMEOUT_MS = const(40)          # 19.5ms start pulse + ~5ms of data, generous margin
+
+DHT11_INTERVAL_MS = const(1000)
+DHT2x_INTERVAL_MS = const(2000)
+
+DHT_IDLE = const(0)
+DHT_BUSY = const(1)
+
 
 class DHT():
+    
+    used_sm = []
 
     @asm_pio(set_init = PIO.OUT_HIGH,
              in_shiftdir = PIO.SHIFT_LEFT,
-             autopush = True)
+             autopush = True,
+             push_thresh = 8)
 
     def io_ops():
-        set(pindirs, 1)                # Set the sensor pin as an output
-        set(pins, 1)                   # Set the pin high
-        nop() [2]                      # Wait a bit
-        set(pins, 0)                   # Set the pin low
-        set(x, 20)                     # Create a delay of approximately 12000 cycles or 12000 / 500000 = 24ms 
-        label('loop1')                 # while holding the pin low
+        wrap_target()
+        pull(block)                    # Sleep until Python requests a reading
+        set(pins, 0)                   # Drive the line low
+        set(pindirs, 1)
+        set(x, 20)                     # Hold it low for 21 x 464 cycles = 9744 / 500000 = 19.5ms
+        label('loop1')                 # (DHT11 needs >= 18ms, DHT2x accepts up to 20ms)
         set(y, 20)
         label('loop2')
-        nop() [26]
+        nop() [20]
         jmp(y_dec, 'loop2')
         jmp(x_dec, 'loop1')
 
         set(pindirs, 0)                # Set sensor pin as an input
-        wait(1, pin, 0)                # Wait for a high level response from the sensor
-        wait(0, pin, 0)                # Wait for a low level response from the sensor
-        wait(1, pin, 0)                # Wait for a high level response from the sensor
-        wait(0, pin, 0)                # Wait for a low level response from the sensor
+        wait(1, pin, 0)                # Wait for the pull-up to release the line
+        wait(0, pin, 0)                # Sensor response low
+        wait(1, pin, 0)                # Sensor response high
+        wait(0, pin, 0)                # Start of the first bit
 
         set(x, 4)                      # Start recording 5 bytes of sensor data output
         label('bytes')
@@ -41,65 +55,138 @@ class DHT():
         in_(pins, 1)                   # After 50us if the sensor is sending high out put then fill ISR with 1 or else fill with 0 and shift by 1 bit 
         wait(0, pin, 0)                # Wait for a low level response from the sensor       
         jmp(y_dec, 'bits')
-        jmp(x_dec, 'bytes')
-        
-        push(block)                    # Finally push data out of RX_FIFO
+        jmp(x_dec, 'bytes')            # Each byte is autopushed to the RX FIFO
+        wrap()
 
 
-    def __init__(self, _pin, _sensor, _sm = 0):
+    def __init__(self, _pin, _sensor, _sm = None):
+        if(_sm == None):
+            _sm = DHT.allocate_sm()
+        elif(_sm in DHT.used_sm):
+            raise ValueError("State machine already used by another DHT")
+        
+        DHT.used_sm.append(_sm)
+        
         self.pin = Pin(_pin, Pin.IN, Pin.PULL_UP)
         self.rh = 0
         self.t = 0
         self.checksum = 0
+        self.errors = 0
         self.sensor = _sensor
-        self.sm = StateMachine(_sm, DHT.io_ops,
-                               freq = 500000,
-                               in_base = self.pin,
-                               set_base = self.pin)
-    	self.sm.active(1)
-    	
-   
-    def get_reading(self):
-        self.sm.restart()
-        value = self.sm.get()
-        CRC = (self.sm.get() & 0xFF)
+        self.sm_id = _sm
         
-        byte_1 = ((value >> 24) & 0xFF)
-        byte_2 = ((value >> 16) & 0xFF)
-        byte_3 = ((value >> 8) & 0xFF)
-        byte_4 = (value & 0xFF)
-
-        self.checksum = (byte_1 + byte_2 + byte_3 + byte_4)
+        if(_sensor == DHT2x_sensor):
+            self.interval_ms = DHT2x_INTERVAL_MS
+        else:
+            self.interval_ms = DHT11_INTERVAL_MS
+            
+        self.state = DHT_IDLE
+        self.deadline = 0
+        self.last_start = ticks_add(ticks_ms(), -self.interval_ms)
+        
+        self.sm = StateMachine(_sm)
+        self.init_sm()
+        
+        
+    @staticmethod
+    def allocate_sm():
+        for i in range(0, DHT_NUM_SM):
+            if(i not in DHT.used_sm):
+                return i
+            
+        raise OSError("No free state machine for DHT")
+        
+        
+    def init_sm(self):
+        # Re-init also clears the FIFOs and puts the program back at pull(), which
+        # recovers a state machine left waiting on a sensor that never answered
+        self.sm.init(DHT.io_ops,
+                     freq = DHT_SM_FREQ,
+                     in_base = self.pin,
+                     set_base = self.pin)
+        self.sm.active(1)
+        
+        
+    def start(self):
+        self.sm.put(0)
+        self.last_start = ticks_ms()
+        self.deadline = ticks_add(self.last_start, DHT_TIMEOUT_MS)
+        self.state = DHT_BUSY
+        
+        
+    def decode(self, data):
+        self.checksum = ((data[0] + data[1] + data[2] + data[3]) & 0xFF)
 
-        if(self.checksum == CRC):
-            sleep_ms(800)
-            if(self.sensor == DHT2x_sensor):
-                sign = 0
-                
-                if(byte_3 & 0x80):
-                    sign = -1
-                    
-                else:
-                    sign = 1
-                
-                self.rh = (((byte_1 << 8) + byte_2) / 10)
-                self.t = (((((byte_3 & 0x7F) << 8) + byte_4) * sign) / 10)
+        if(data[4] != self.checksum):
+            return False
+        
+        if(self.sensor == DHT2x_sensor):
+            sign = 0
+            
+            if(data[2] & 0x80):
+                sign = -1
                 
             else:
-                self.rh = (byte_1 + (byte_2 / 100))
-                self.t = (byte_3 + (byte_4 / 100))
+                sign = 1
+            
+            self.rh = (((data[0] << 8) + data[1]) / 10)
+            self.t = (((((data[2] & 0x7F) << 8) + data[3]) * sign) / 10)
+            
+        else:
+            self.rh = (data[0] + (data[1] / 100))
+            self.t = (data[2] + (data[3] / 100))
+            
+        return True
+        
+        
+    def poll(self):
+        # Never blocks: returns True once per fresh, checksum-valid reading
+        now = ticks_ms()
+        
+        if(self.state == DHT_IDLE):
+            if(ticks_diff(now, self.last_start) >= self.interval_ms):
+                self.start()
+            return False
         
-       
+        if(self.sm.rx_fifo() >= DHT_FRAME_BYTES):
+            data = [(self.sm.get() & 0xFF) for i in range(0, DHT_FRAME_BYTES)]
+            self.state = DHT_IDLE
+            
+            if(self.decode(data) == True):
+                return True
+            
+            self.errors += 1
+            return False
+        
+        if(ticks_diff(now, self.deadline) > 0):
+            self.errors += 1
+            self.init_sm()
+            self.state = DHT_IDLE
+            
+        return False
+   
+   
+    def get_reading(self):
+        # Blocking wrapper, bounded by DHT_TIMEOUT_MS
+        self.start()
+        
+        while(self.state == DHT_BUSY):
+            if(self.poll() == True):
+                return True
+            
+        return False
+    
+    
+    def deinit(self):
+        self.sm.active(0)
+        DHT.used_sm.remove(self.sm_id)
 
 
 class DHT11(DHT):
-    def __init__(self, pin, sm = 0):
+    def __init__(self, pin, sm = None):
         super().__init__(pin, DHT11_sensor, sm)
 
 
 class DHT2x(DHT):
-    def __init__(self, pin, sm = 0):
+    def __init__(self, pin, sm = None):
         super().__init__(pin, DHT2x_sensor, sm)
-
-
-
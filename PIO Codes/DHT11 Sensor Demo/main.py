@@ -27,11 +27,13 @@ def write_text(text, x, y, size, color):
 
 
 while(True):
+    if(dht.poll() == False):
+        sleep_ms(10)
+        continue
+    
     LED.toggle()
-    dht.get_reading()
     tft.fill(tft.BLACK)
     write_text("DHT11 PIO", 10, 4, 3, tft.CYAN)
     write_text(("RH/%: " + str("%2.1f" %dht.rh)), 0, 56, 3, tft.GREEN)
     write_text(("T/'C: " + str("%2.1f" %dht.t)), 0, 96, 3, tft.RED)
     tft.show()
-    sleep_ms(400)
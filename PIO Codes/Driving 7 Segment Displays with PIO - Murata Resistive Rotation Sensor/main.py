@@ -1,6 +1,7 @@
-from machine import Pin, ADC
+from machine import Pin
 from utime import sleep_ms
 from rp2 import PIO, asm_pio, StateMachine
+from ADC_DMA import ADC_Sampler
 
 
 seg = 0
@@ -92,20 +93,11 @@ sm2 = StateMachine(1, periodic_irq, freq = 100000)
 sm2.irq(periodic_irq_callback)
 sm2.active(1)
 
-angle_sensor = ADC(Pin(28))
+angle_sensor = ADC_Sampler([2])
 
 
 while(True):
-    angle_sensor_value = 0 
-    avg = 0
-        
-    for i in range (0, 16):
-        avg += angle_sensor.read_u16()
-        sleep_ms(10)
-        
-    avg >>= 4
-    
-    angle_sensor_value = ((avg * 360) / 65536)
+    angle_sensor_value = ((angle_sensor.read_u16(2) * 360) / 65536)
     
     value = int(angle_sensor_value)
     sleep_ms(600)
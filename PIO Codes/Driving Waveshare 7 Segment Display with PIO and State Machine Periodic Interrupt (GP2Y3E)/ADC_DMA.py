@@ -0,0 +1,200 @@
+from array import array
+
+try:
+    from micropython import const
+except ImportError:                     # host side, see ADC_Replay
+    const = lambda x : x
+
+try:
+    from machine import Pin, ADC, mem32
+    from rp2 import DMA
+    from utime import sleep_ms, ticks_ms, ticks_diff
+except ImportError:
+    DMA = None
+
+
+ADC_BASE = const(0x4004C000)
+ADC_CS = const(0x00)
+ADC_FCS = const(0x08)
+ADC_FIFO = const(0x0C)
+ADC_DIV = const(0x10)
+
+ADC_CS_EN = const(0x01)
+ADC_CS_TS_EN = const(0x02)
+ADC_CS_START_MANY = const(0x08)
+
+ADC_FCS_EN = const(0x01)
+ADC_FCS_DREQ_EN = const(0x08)
+ADC_FCS_UNDER = const(0x400)
+ADC_FCS_OVER = const(0x800)
+ADC_FCS_THRESH_1 = const(0x1000000)
+
+ADC_CLOCK = const(48000000)
+ADC_MIN_RATE = const(733)               # 16 bit divider limit
+ADC_MAX_RATE = const(500000)
+ADC_TEMP_CHANNEL = const(4)
+
+DREQ_ADC = const(36)
+
+DEFAULT_RATE = const(1000)              # samples per second on each channel
+DEFAULT_DECIMATION = const(64)          # samples averaged into one reading
+
+
+class ADC_Filter():
+
+    # Splits an interleaved round-robin block into per-channel averages. Shared by the
+    # DMA sampler and the host replay, so the maths can be checked off the board.
+    def __init__(self, channels, decimation = DEFAULT_DECIMATION):
+        self.channels = sorted(channels)            # round robin runs in ascending order
+        self.decimation = decimation
+        self.block = decimation * len(self.channels)
+        self.values = [0] * len(self.channels)
+        self.blocks = 0
+
+
+    def process(self, buf):
+        n = len(self.channels)
+
+        for c in range(0, n):
+            total = 0
+            for k in range(c, self.block, n):
+                total += buf[k]
+
+            self.values[c] = (total << 4) // self.decimation      # 12 bit -> read_u16() scale
+
+        self.blocks += 1
+
+
+    def read_u16(self, channel):
+        return self.values[self.channels.index(channel)]
+
+
+    def read_uv(self, channel):
+        return (self.read_u16(channel) * 3300000) // 65536
+
+
+    def ready(self, last):
+        # Poll with the block count from the previous call: if(adc.ready(n)): n = adc.blocks
+        return (self.blocks != last)
+
+
+class ADC_Sampler(ADC_Filter):
+
+    # Free-running round-robin ADC feeding its FIFO, paced by the ADC divider. Two DMA
+    # channels chained to each other fill a pair of buffers, so there is no gap to refill
+    # in software: each IRQ only re-arms the finished channel and averages its buffer.
+    def __init__(self, channels, rate = DEFAULT_RATE, decimation = DEFAULT_DECIMATION):
+        super().__init__(channels, decimation)
+
+        total_rate = rate * len(self.channels)
+        if((total_rate < ADC_MIN_RATE) or (total_rate > ADC_MAX_RATE)):
+            raise ValueError("ADC runs between 733 sps and 500 ksps shared between all channels")
+
+        self.rate = rate
+        self.overruns = 0
+
+        self.buffers = [array('H', [0] * self.block), array('H', [0] * self.block)]
+
+        mask = 0
+        for c in self.channels:
+            if(c < ADC_TEMP_CHANNEL):
+                ADC(Pin(26 + c))                    # analogue pad setup for GP26..GP29
+            mask |= (1 << c)
+
+        mem32[ADC_BASE + ADC_CS] = 0
+        while(mem32[ADC_BASE + ADC_FCS] & 0xF0000):  # drain the FIFO level
+            mem32[ADC_BASE + ADC_FIFO]
+
+        mem32[ADC_BASE + ADC_FCS] = ADC_FCS_EN | ADC_FCS_DREQ_EN | ADC_FCS_THRESH_1 | ADC_FCS_UNDER | ADC_FCS_OVER
+        mem32[ADC_BASE + ADC_DIV] = ((ADC_CLOCK * 256) // total_rate) - 256
+
+        self.dma = [DMA(), DMA()]
+
+        for i in range(0, 2):
+            ctrl = self.dma[i].pack_ctrl(size = 1, inc_read = False, inc_write = True,
+                                         treq_sel = DREQ_ADC, chain_to = self.dma[i ^ 1].channel,
+                                         irq_quiet = False)      # pack_ctrl() defaults to no IRQ
+            self.dma[i].config(read = ADC_BASE + ADC_FIFO, write = self.buffers[i], count = self.block, ctrl = ctrl)
+            self.dma[i].irq(self.dma_handler)
+
+        self.dma[0].active(1)
+
+        cs = ADC_CS_EN | (mask << 16) | (self.channels[0] << 12) | ADC_CS_START_MANY
+        if(mask & (1 << ADC_TEMP_CHANNEL)):
+            cs |= ADC_CS_TS_EN
+
+        mem32[ADC_BASE + ADC_CS] = cs
+
+        # Callers read straight away, so hold on until the first block has been averaged
+        # rather than hand out zeros for the first decimation / rate seconds
+        self.wait_first_block(((2000 * decimation) // rate) + 100)
+
+
+    def wait_first_block(self, timeout_ms):
+        t0 = ticks_ms()
+
+        while((self.blocks == 0) and (ticks_diff(ticks_ms(), t0) < timeout_ms)):
+            sleep_ms(1)
+
+        return (self.blocks > 0)
+
+
+    def dma_handler(self, dma):
+        i = 0 if (dma.channel == self.dma[0].channel) else 1
+
+        dma.write = self.buffers[i]
+        dma.count = self.block
+
+        if(mem32[ADC_BASE + ADC_FCS] & ADC_FCS_OVER):
+            mem32[ADC_BASE + ADC_FCS] |= ADC_FCS_OVER   # write 1 to clear
+            self.overruns += 1
+
+        self.process(self.buffers[i])
+
+
+    def record(self, filename, blocks):
+        # Dump raw interleaved blocks, one sample per line, for ADC_Replay
+        with open(filename, "w") as f:
+            last = self.blocks
+            while(blocks > 0):
+                if(self.ready(last)):
+                    last = self.blocks
+                    for v in self.buffers[(last - 1) & 1]:
+                        f.write(str(v) + "\n")
+                    blocks -= 1
+
+
+    def deinit(self):
+        mem32[ADC_BASE + ADC_CS] = ADC_CS_EN
+        mem32[ADC_BASE + ADC_FCS] = 0
+
+        for d in self.dma:
+            d.irq(None)
+            d.close()
+
+
+class ADC_Replay(ADC_Filter):
+
+    # Host stand-in for ADC_Sampler fed from a list or a file written by record()
+    def __init__(self, channels, samples, decimation = DEFAULT_DECIMATION):
+        super().__init__(channels, decimation)
+
+        if(type(samples) is str):
+            with open(samples) as f:
+                samples = [int(line) for line in f if line.strip()]
+
+        self.samples = samples
+        self.position = 0
+
+
+    def step(self):
+        # Consume one block as the DMA IRQ would, False when the recording runs out
+        end = self.position + self.block
+
+        if(end > len(self.samples)):
+            return False
+
+        self.process(self.samples[self.position : end])
+        self.position = end
+
+        return True
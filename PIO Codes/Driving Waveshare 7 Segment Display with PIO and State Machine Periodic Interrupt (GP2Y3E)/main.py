@@ -1,7 +1,8 @@
 from micropython import const
-from machine import Pin, ADC
+from machine import Pin
 from utime import sleep_ms
 from rp2 import PIO, asm_pio, StateMachine
+from ADC_DMA import ADC_Sampler
 
 
 mosi_pin = const(11)
@@ -118,25 +119,13 @@ sm2.irq(periodic_irq_callback)
 sm2.active(1)
 
 
-d_sensor = ADC(Pin(27))
 state_pin = Pin(16, Pin.OUT)
-
+state_pin.on()                  # sampling is continuous now, so the sensor stays enabled
+d_sensor = ADC_Sampler([1], 1000, 128)
 
 
 while(True):
-    d = 0
-    avg = 0
-    state_pin.on()
-        
-    for i in range (0, 8):
-        avg += d_sensor.read_u16()
-        sleep_ms(10)
-        
-    avg >>= 3
-    
-    state_pin.off()
-    
-    d = ((avg * 3300.0) / 65536.0)
+    d = ((d_sensor.read_u16(1) * 3300.0) / 65536.0)
     value = int(3140.25 - (d * 2.158))
     sleep_ms(400)
 
@@ -1,7 +1,8 @@
 from micropython import const
-from machine import Pin, ADC, Timer
+from machine import Pin, Timer
 from utime import sleep_ms
 from rp2 import PIO, asm_pio, StateMachine
+from ADC_DMA import ADC_Sampler
 
 
 mosi_pin = const(11)
@@ -99,17 +100,11 @@ def timer_callback(t):
 
 
 tim = Timer(mode = Timer.PERIODIC, period = 1,  callback = timer_callback)
-t_sensor = ADC(Pin(26))
+t_sensor = ADC_Sampler([0])
 
 
 while(True):
-    avg = 0
-    for i in range (0, 64):
-        avg += t_sensor.read_u16()
-        sleep_ms(4)
-    avg >>= 6
-    
-    t_reading =  avg * conversion_factor
+    t_reading =  t_sensor.read_u16(0) * conversion_factor
     value = (t_reading / 3)
     sleep_ms(250)
 
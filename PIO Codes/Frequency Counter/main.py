@@ -1,34 +1,155 @@
 from machine import Pin
-from time import sleep_ms, ticks_us
+from micropython import const
+from time import sleep_ms, ticks_ms, ticks_diff
 from rp2 import asm_pio, StateMachine, PIO
 from ST7789 import TFT114
 
-t1 = 0
-t2 = 0
-t_diff = 0
+
+SM_FREQ = const(125000000)
+
+MODE_PERIOD = const(0)
+MODE_GATED = const(1)
+
+GATE_TIME_MS = const(100)
+PERIOD_CYCLES_PER_COUNT = const(2)
+GATED_CYCLES_PER_COUNT = const(3)
+
+AUTO_RANGE_UP_HZ = const(20000)         # period mode -> gated mode above this
+AUTO_RANGE_DOWN_HZ = const(10000)       # gated mode -> period mode below this
+NO_SIGNAL_TIMEOUT_MS = const(3000)
+
+
+mode = MODE_GATED
+f = 0
+period = 0
+last_sample_ms = 0
 
 
 @asm_pio()
-def IO_ops():
-    irq(clear, 0)              # clear irq 0
-    wait(1, pin, 0)            # wait for high logic on pin index 0, i.e sense pin
-    irq(rel(0))                # raise IRQ 0
-    wait(0, pin, 0)            # wait for logic low on pin index 0, i.e sense pin   
-    
-    
-def irq_0_handler(sm):
-    global t1, t2, t_diff
-    t2 = ticks_us()
-    t_diff = (t2 - t1)
-    t1 = t2
+def period_ops():
+    wrap_target()
+    mov(x, invert(null))       # x = 0xFFFFFFFF, counts down once per 2 cycles
+    wait(0, pin, 0)            # sync to a rising edge on the sense pin
+    wait(1, pin, 0)
+    label("high")
+    jmp(x_dec, "high_next")
+    label("high_next")
+    jmp(pin, "high")           # count while the input is high
+    label("low")
+    jmp(pin, "done")           # next rising edge ends the period
+    jmp(x_dec, "low")          # count while the input is low
+    label("done")
+    mov(isr, invert(x))        # isr = period in 2 cycle counts
+    push(noblock)
+    wrap()
+
+
+@asm_pio()
+def gated_ops():
+    wrap_target()
+    mov(x, invert(null))       # x = 0xFFFFFFFF, one decrement per rising edge
+    mov(y, osr)                # y = gate length in 3 cycle loop iterations
+    label("high")
+    jmp(y_dec, "high_next")
+    jmp("done")
+    label("high_next")
+    jmp(pin, "high") [1]       # 3 cycles per iteration while the input is high
+    label("low")
+    jmp(y_dec, "low_next")
+    jmp("done")
+    label("low_next")
+    jmp(pin, "rise")
+    jmp("low")                 # 3 cycles per iteration while the input is low
+    label("rise")
+    jmp(x_dec, "high")         # count the edge, still 3 cycles for this iteration
+    label("done")
+    mov(isr, invert(x))        # isr = rising edges seen during the gate
+    push(noblock)
+    wrap()
     
     
 sense_pin = Pin(0, Pin.IN)
 tft = TFT114()
     
-sm = StateMachine(0, IO_ops, in_base = sense_pin)
-sm.irq(irq_0_handler)
-sm.active(1)
+sm = StateMachine(0)
+
+
+def gate_iterations(gate_ms):
+    return ((SM_FREQ // 1000) * gate_ms) // GATED_CYCLES_PER_COUNT
+
+
+def start_period_mode():
+    global mode
+    
+    sm.active(0)
+    sm.init(period_ops, freq = SM_FREQ, in_base = sense_pin, jmp_pin = sense_pin)
+    sm.active(1)
+    mode = MODE_PERIOD
+
+
+def start_gated_mode(gate_ms = GATE_TIME_MS):
+    global mode
+    
+    sm.active(0)
+    sm.init(gated_ops, freq = SM_FREQ, in_base = sense_pin, jmp_pin = sense_pin)
+    sm.put(gate_iterations(gate_ms) - 1)
+    sm.exec("pull()")
+    sm.active(1)
+    mode = MODE_GATED
+
+
+def read_period_mode():
+    global f, period, last_sample_ms
+    
+    total = 0
+    samples = 0
+    
+    while(sm.rx_fifo() > 0):
+        total += sm.get()
+        samples += 1
+        
+    if(samples > 0):
+        period = (total * PERIOD_CYCLES_PER_COUNT * 1000000) / (samples * SM_FREQ)
+        f = 1000000 / period
+        last_sample_ms = ticks_ms()
+    
+    
+def read_gated_mode(gate_ms = GATE_TIME_MS):
+    global f, period, last_sample_ms
+    
+    edges = -1
+    
+    while(sm.rx_fifo() > 0):
+        edges = sm.get()
+        
+    if(edges >= 0):
+        f = (edges * 1000) / gate_ms
+        if(edges > 0):
+            period = 1000000 / f
+        else:
+            period = 0
+        last_sample_ms = ticks_ms()
+    
+    
+def measure():
+    global f, period
+    
+    if(mode == MODE_PERIOD):
+        read_period_mode()
+        
+        if(f > AUTO_RANGE_UP_HZ):
+            start_gated_mode()
+            
+    else:
+        read_gated_mode()
+        
+        if(f < AUTO_RANGE_DOWN_HZ):
+            start_period_mode()
+            
+    # Period mode never pushes without edges, so report no signal after a while
+    if(ticks_diff(ticks_ms(), last_sample_ms) > NO_SIGNAL_TIMEOUT_MS):
+        f = 0
+        period = 0
 
 
 def write_text(text, x, y, size, color):
@@ -47,24 +168,27 @@ def write_text(text, x, y, size, color):
             tft.fill_rect(size*px_info[0] - (size-1)*x , size*px_info[1] - (size-1)*y, size, size, px_info[2]) 
 
 
+start_gated_mode()
+
+
 while(True):
-    period = t_diff
+    measure()
     tft.fill(tft.BLACK)
     write_text("RP2040 PICO PIO", 0, 6, 2, tft.WHITE)
     write_text("Frequency Meter", 0, 30, 2, tft.WHITE)
     
-    if(period > 999):
-        f = 1000000 / (period + 1)
-        write_text("f/ Hz: " + str("%2.2f" %f), 2, 65, 2, tft.MAGENTA)
+    if(f >= 1000000):
+        write_text("f/MHz: " + str("%2.3f" %(f / 1000000)), 2, 65, 2, tft.MAGENTA)
+    elif(f >= 1000):
+        write_text("f/kHz: " + str("%2.2f" %(f / 1000)), 2, 65, 2, tft.MAGENTA)
     else:
-        f = 1000 / (period + 1)
-        write_text("f/kHz: " + str("%2.2f" %f), 2, 65, 2, tft.MAGENTA)
-    
+        write_text("f/ Hz: " + str("%2.2f" %f), 2, 65, 2, tft.MAGENTA)
     
-    write_text("T/us : " + str("%4u" %period), 2, 105, 2, tft.CYAN)
+    if(mode == MODE_PERIOD):
+        write_text("T/us : " + str("%4.2f" %period), 2, 105, 2, tft.CYAN)
+    else:
+        write_text("Gate : " + str("%3u ms" %GATE_TIME_MS), 2, 105, 2, tft.CYAN)
     
     tft.show()
 
-    sleep_ms(600)
-    
-
+    sleep_ms(GATE_TIME_MS)
@@ -1,69 +1,83 @@
 from machine import Pin
+from micropython import const
 from rp2 import asm_pio, StateMachine, PIO
-from utime import sleep_ms, sleep_us, ticks_us, ticks_diff
 
 
-t1 = 0
-t2 = 0
-t_diff = 0
+SONAR_SM_FREQ = const(2000000)          # 2 instructions per echo count -> 1 count = 1us
+SONAR_MIN_INTERVAL_MS = const(60)       # HC-SR04 datasheet recommends >= 60ms between pings
 
 
 class SONAR():
     
     @asm_pio(sideset_init = PIO.OUT_LOW)
     def IO_ops():
-        irq(clear, 0)              # clear irq 0
-        irq(clear, 1)              # clear irq 1
-        set(x, 9)                  # set x scratch register to count 10 (approximately 10 / 1000000 = 10us high time is needed for HC-SR04 to be triggred)
-        nop() .side(1)             # wait one cycle and set the trigger pin high
-        label("trigger")           # trigger delay start
-        jmp(x_dec, "trigger")      # decement x scratch register value and loopback until x scratch register is zero
-        nop() .side(0)             # wait one cycle and set the trigger pin low
+        wrap_target()
+        mov(x, invert(null))       # x = 0xFFFFFFFF, echo counter counts down from here
+        set(y, 19) .side(1)        # set the trigger pin high, 20 x 0.5us loop = 10us trigger pulse
+        label("trigger")
+        jmp(y_dec, "trigger") .side(1)
+        nop() .side(0)             # set the trigger pin low
 
-        wait(1, pin, 0)            # wait for high logic on pin index 0, i.e echo pin
-        irq(0)                     # set IRQ index 0 and wait for IRQ ack
-        wait(0, pin, 0)            # wait for logic low on pin index 0, i.e echo pin
-        irq(1)                     # set IRQ index 1 and wait for IRQ ack
-        
+        wait(1, pin, 0)            # wait for the echo pin to go high
+        label("count")
+        jmp(x_dec, "echo")         # one decrement per loop of two instructions, i.e. per 1us
+        label("echo")
+        jmp(pin, "count")          # keep counting while the echo pin is high
+        mov(isr, invert(x))        # isr = number of 1us counts the echo pin was high
+        push(noblock)              # hand the pulse width to the RX FIFO, drop it if nobody reads
+
+        mov(y, osr)                # ping interval in us, preloaded into the OSR
+        label("holdoff")
+        jmp(y_dec, "holdoff") [1]  # 2 cycles = 1us per loop
+        wrap()
         
-    def irq_0_handler(sm):
-        global t1, t2, t_diff
-        t1 = 0
-    
     
-    def irq_1_handler(sm):
-        global t1, t2, t_diff
-        t2 = ticks_us()
-        t_diff = ticks_diff(t2, t1)
-        t1 = t2
+    def read(self):
+        # Drain the RX FIFO and keep only the newest pulse width
+        while(self.sm.rx_fifo() > 0):
+            self.t_diff = self.sm.get()
+            self.count += 1
+            
+        return self.t_diff
         
         
     def get_reading_in_cm(self):
-        global t_diff
-        return (t_diff // 58)
+        return (self.read() // 58)
     
     
     def get_reading_in_in(self):
-        global t_diff
-        return (t_diff // 148)
+        return (self.read() // 148)
     
     
     def get_reading_us(self):
-        global t_diff 
-        return (t_diff)
+        return (self.read())
+    
+    
+    def set_interval(self, interval_ms):
+        if(interval_ms < SONAR_MIN_INTERVAL_MS):
+            interval_ms = SONAR_MIN_INTERVAL_MS
+            
+        self.interval_ms = interval_ms
+        
+        # Re-init so the program starts again from the top with the new interval in the OSR
+        self.sm.init(SONAR.IO_ops, freq = SONAR_SM_FREQ, in_base = self.ECHO_pin, jmp_pin = self.ECHO_pin, sideset_base = self.TRIGGER_pin)
+        self.sm.put(interval_ms * 1000)
+        self.sm.exec("pull()")
+        self.sm.active(1)
+        
+        
+    def stop(self):
+        self.sm.active(0)
     
         
-    def __init__(self, _trigger_pin, _echo_pin, _sm = 0):
-        self.sm = _sm
+    def __init__(self, _trigger_pin, _echo_pin, _sm = 0, interval_ms = SONAR_MIN_INTERVAL_MS):
+        self.t_diff = 0
+        self.count = 0
         
         self.ECHO_pin = Pin(_echo_pin, Pin.IN)
         self.TRIGGER_pin = Pin(_trigger_pin, Pin.OUT)
         
-        self.sm = StateMachine(0, SONAR.IO_ops, in_base = self.ECHO_pin, sideset_base = self.TRIGGER_pin, freq = 1000000)
+        self.sm = StateMachine(_sm)
 
-        self.sm.irq(SONAR.irq_0_handler)
-        self.sm.irq(SONAR.irq_1_handler)
-
-        self.sm.active(1)        
+        self.set_interval(interval_ms)
     
-
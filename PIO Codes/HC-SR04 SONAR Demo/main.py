@@ -8,7 +8,7 @@ from ST7789 import TFT114
 bar = 0
 distance = 0
 
-sonar = SONAR(15, 14)
+sonar = SONAR(15, 14, 0, 60)
 tft = TFT114()
 
 
@@ -63,5 +63,5 @@ while(True):
     
     tft.show()
     
-    sleep_ms(600)
+    sleep_ms(100)
 
@@ -1,6 +1,16 @@
 from machine import Pin
+from micropython import const
 from rp2 import PIO, StateMachine, asm_pio
-from time import ticks_ms, sleep_ms
+from time import ticks_ms, ticks_diff, sleep_ms
+from array import array
+
+
+HX711_RING_SIZE = const(32)         # raw samples kept, 3.2s at 10 SPS
+HX711_MEDIAN_SIZE = const(5)        # window of the streaming median
+HX711_AVG_SIZE = const(10)          # window of the moving average
+HX711_OUTLIER_LIMIT = const(500)    # raw counts away from the median that count as a spike
+HX711_SAMPLE_MS = const(100)        # conversion period at the slower 10 SPS rate
+HX711_WAIT_MARGIN_MS = const(200)
 
 
 class HX711_PIO:
@@ -23,6 +33,7 @@ class HX711_PIO:
             set(pins, 1) [1]    
             set(pins, 0) [1]     
             jmp(y_dec, "extra_pulse_loop") 
+            irq(rel(0))                       # conversion pushed, let Python drain it
          
         return read_HX711
 
@@ -40,6 +51,20 @@ class HX711_PIO:
             self.scale_factor = (self.scale_factor / 4)
         elif(sck_pulses == 27):
             self.scale_factor = (self.scale_factor / 2)
+            
+        self.ring = array('i', [0] * HX711_RING_SIZE)
+        self.head = 0
+        self.count = 0
+        
+        self.median_buf = array('i', [0] * HX711_MEDIAN_SIZE)
+        self.median = 0
+        self.rejects = 0
+        
+        self.avg_ring = array('i', [0] * HX711_AVG_SIZE)
+        self.avg_head = 0
+        self.avg_count = 0
+        self.avg_sum = 0
+        self.average = 0
         
         pio_program = self.create_pio_program((sck_pulses - 24))
         
@@ -48,9 +73,61 @@ class HX711_PIO:
                                in_base = self.dout,
                                set_base = self.sck)
         
+        self.sm.irq(self.irq_handler)
         self.sm.active(1)
-        self.reset()
         self.noload_reading()
+        
+        
+    def irq_handler(self, sm):
+        while(self.sm.rx_fifo() > 0):
+            raw = self.sm.get()
+            
+            if(raw & 0x800000):
+                raw -= 0x1000000
+                
+            self.store(raw >> 8)
+            
+            
+    def store(self, raw):
+        self.ring[self.head] = raw
+        self.head = (self.head + 1) % HX711_RING_SIZE
+        self.count += 1
+        
+        self.median = self.window_median()
+        
+        # Spikes are replaced by the median, but a run of them is a real load change
+        if((self.count > HX711_MEDIAN_SIZE) and (abs(raw - self.median) > HX711_OUTLIER_LIMIT) and (self.rejects < HX711_MEDIAN_SIZE)):
+            self.rejects += 1
+            raw = self.median
+        else:
+            self.rejects = 0
+            
+        self.avg_sum += raw - self.avg_ring[self.avg_head]
+        self.avg_ring[self.avg_head] = raw
+        self.avg_head = (self.avg_head + 1) % HX711_AVG_SIZE
+        
+        if(self.avg_count < HX711_AVG_SIZE):
+            self.avg_count += 1
+            
+        self.average = self.avg_sum / self.avg_count
+        
+        
+    def window_median(self):
+        # Insertion sort of the last few samples into a preallocated buffer
+        n = min(self.count, HX711_MEDIAN_SIZE)
+        buf = self.median_buf
+        
+        for i in range(0, n):
+            v = self.ring[(self.head - 1 - i) % HX711_RING_SIZE]
+            j = i
+            
+            while((j > 0) and (buf[j - 1] > v)):
+                buf[j] = buf[j - 1]
+                j -= 1
+                
+            buf[j] = v
+            
+        return buf[n // 2]
 
 
     def reset(self):
@@ -61,70 +138,57 @@ class HX711_PIO:
 
     def power_down(self):
         self.sck.value(1)
-        sleep_ms(1)  
+        sleep_ms(1)  # Minimum 60μs required
     
 
     def power_up(self):
         self.sck.value(0)
-
-
-    def get_raw(self):
-        t0 = ticks_ms()
-        while((self.sm.rx_fifo() > 0) and ((ticks_ms() - t0) > self.timeout)):
-            self.sm.get()
         
+        
+    def wait_samples(self, samples):
+        # Block until `samples` new conversions have arrived. The timeout covers one
+        # conversion, so it is stretched to what `samples` take at 10 SPS plus a margin
+        target = self.count + samples
+        timeout = max(self.timeout, ((samples * HX711_SAMPLE_MS) + HX711_WAIT_MARGIN_MS))
         t0 = ticks_ms()
-        while((self.sm.rx_fifo() == 0) and ((ticks_ms() - t0) > self.timeout)):
-            pass
         
-        raw = (self.sm.get() >> 8)
-
-        if(raw & 0x800000):
-            raw -= 0x1000000
+        while((self.count < target) and (ticks_diff(ticks_ms(), t0) < timeout)):
+            sleep_ms(10)
             
-        return raw
+        return (self.count >= target)
+
+
+    def get_raw(self):
+        self.wait_samples(1)
+        return self.ring[(self.head - 1) % HX711_RING_SIZE]
     
 
     def avg_reading(self, samples):
-        i = samples
-        value = 0
-        self.power_up()
+        if(samples > HX711_RING_SIZE):
+            samples = HX711_RING_SIZE
+            
+        self.wait_samples(samples)
         
-        while(i > 0):
-            value += self.get_raw()
-            i -= 1
+        value = 0
+        for i in range(0, samples):
+            value += self.ring[(self.head - 1 - i) % HX711_RING_SIZE]
         
         value /= samples
         value -= self.offset
         
-        self.power_down()
-        
         return abs(value)
     
     
     def noload_reading(self):
-        self.offset = self.avg_reading(25) 
+        self.wait_samples(HX711_AVG_SIZE)
+        self.offset = self.average
         
     
     def get_mass(self):
-        value = (self.avg_reading(10) / self.scale_factor)
+        # Returns straight away from the filtered state, no conversions are awaited
+        value = (abs(self.average - self.offset) / self.scale_factor)
         
         if((value <= 0) or (value > 5000)):
             value = 0
         
         return value
-    
-    
-    def reset(self):
-        self.power_down()
-        self.power_up()
-        sleep_ms(400)
-    
-
-    def power_down(self):
-        self.sck.value(1)
-        sleep_ms(1)  # Minimum 60μs required
-    
-
-    def power_up(self):
-        self.sck.value(0)
\ No newline at end of file
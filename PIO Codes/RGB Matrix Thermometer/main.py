@@ -1,5 +1,5 @@
-from machine import ADC
 from RGB_Matrix import RGB_Matrix
+from ADC_DMA import ADC_Sampler
 from utime import sleep_ms
 
 
@@ -9,7 +9,7 @@ conversion_factor = 3300.0 / 65535.0
 t = 0
 tgl = 0
 ws = RGB_Matrix(6)
-TMP36 = ADC(1)
+TMP36 = ADC_Sampler([1])
 
 
 def map_value(v, x_min, x_max, y_min, y_max):
@@ -26,14 +26,6 @@ def constrain_value(v, max_v, min_v):
     return v
 
 
-def adc_avg():
-    avg = 0
-    for i in range (0, 16):
-        avg += TMP36.read_u16()
-        
-    return (avg >> 4)
-
-
 def graphical_thermometer(value):
     ws.pixels_fill(ws.BLACK)
 
@@ -70,7 +62,7 @@ def numerical_thermometer(value):
     
 
 while(True):
-    tmp = conversion_factor * adc_avg()
+    tmp = conversion_factor * TMP36.read_u16(1)
     t = int(tmp / 28.0)
     
     tgl = (tgl ^ 1)
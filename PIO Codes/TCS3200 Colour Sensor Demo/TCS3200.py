@@ -1,12 +1,12 @@
 from machine import Pin
-from time import sleep_ms, ticks_us
+from time import ticks_ms, ticks_diff, ticks_add
 from rp2 import asm_pio, StateMachine, PIO
 from micropython import const
 
 
-t1 = 0
-t2 = 0
-t_diff = 0
+TCS3200_SM_FREQ = const(2000000)        # 2 instructions per count -> 1 count = 1us
+TCS3200_SAMPLES = const(4)              # periods averaged per filter
+TCS3200_TIMEOUT_MS = const(50)          # give up on a filter below ~40 Hz output
 
 
 class TCS3200():
@@ -14,20 +14,24 @@ class TCS3200():
     @asm_pio()
     
     def IO_ops():
-        irq(clear, 0)              # clear irq 0
-        wait(1, pin, 0)            # wait for high logic on pin index 0, i.e sense pin
-        irq(rel(0))                # raise IRQ 0
-        wait(0, pin, 0)            # wait for logic low on pin index 0, i.e sense pin
-        
-        
-    def irq_0_handler(sm):
-        global t1, t2, t_diff
-        t2 = ticks_us()
-        t_diff = (t2 - t1)
-        t1 = t2
+        wrap_target()
+        mov(x, invert(null))       # x = 0xFFFFFFFF, counts down once per 1us
+        wait(0, pin, 0)            # sync to a rising edge on the sense pin
+        wait(1, pin, 0)
+        label("high")
+        jmp(x_dec, "high_next")
+        label("high_next")
+        jmp(pin, "high")           # count while the output is high
+        label("low")
+        jmp(pin, "done")           # next rising edge ends the period
+        jmp(x_dec, "low")          # count while the output is low
+        label("done")
+        mov(isr, invert(x))        # isr = output period in us
+        push(noblock)
+        wrap()
     
     
-    def __init__(self, _f_pin, _s0_pin, _s1_pin, _s2_pin, _s3_pin):
+    def __init__(self, _f_pin, _s0_pin, _s1_pin, _s2_pin, _s3_pin, _sm = 0):
         self.LOW_POWER_MODE = const(0x00)
         self.F_2_PC_MODE = const(0x01)
         self.F_20_PC_MODE = const(0x02)
@@ -45,18 +49,26 @@ class TCS3200():
         self.s2_pin = Pin(_s2_pin, Pin.OUT)
         self.s3_pin = Pin(_s3_pin, Pin.OUT)
         
-        self.sm = StateMachine(0,
+        self.period = 0
+        
+        self.sm = StateMachine(_sm,
                                TCS3200.IO_ops,
-                               in_base = self.f_pin)
+                               freq = TCS3200_SM_FREQ,
+                               in_base = self.f_pin,
+                               jmp_pin = self.f_pin)
         
-        self.sm.irq(TCS3200.irq_0_handler)
+        self.sm.active(1)
         
         
-    def get_raw_reading(self, out_mode, filter_mode):
-        global t_diff
+    def wait_period(self, deadline):
+        while(self.sm.rx_fifo() == 0):
+            if(ticks_diff(deadline, ticks_ms()) <= 0):
+                return -1
+            
+        return self.sm.get()
         
-        self.sm.active(0)
         
+    def get_raw_reading(self, out_mode, filter_mode, samples = TCS3200_SAMPLES):
         if(out_mode == self.F_2_PC_MODE):
             self.s1_pin.off()
             self.s0_pin.on()
@@ -89,12 +101,35 @@ class TCS3200():
             self.s3_pin.off()
             self.s2_pin.off()
             
-        self.sm.active(1)    
-        sleep_ms(100)
+        # Periods captured before the switch are stale and the one in progress straddles
+        # it, so drop both and average the next few instead of waiting a fixed settle time
+        while(self.sm.rx_fifo() > 0):
+            self.sm.get()
+            
+        deadline = ticks_add(ticks_ms(), TCS3200_TIMEOUT_MS)
+        
+        if(self.wait_period(deadline) < 0):
+            self.period = TCS3200_TIMEOUT_MS * 1000
+            return self.period
         
-        period = t_diff + 1
+        total = 0
+        count = 0
+        
+        for i in range(0, samples):
+            t = self.wait_period(deadline)
+            
+            if(t < 0):
+                break
+            
+            total += t
+            count += 1
+            
+        if(count == 0):
+            self.period = TCS3200_TIMEOUT_MS * 1000
+        else:
+            self.period = (total // count) + 1
         
-        return period
+        return self.period
     
     
     def get_color_reading(self):
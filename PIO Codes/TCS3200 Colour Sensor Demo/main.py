@@ -1,5 +1,5 @@
 from machine import Pin
-from utime import sleep_ms, 
+from utime import sleep_ms
 from TCS3200 import TCS3200
 from ST7789 import TFT114
 
@@ -49,6 +49,6 @@ while(True):
     
     tft.show()
         
-    sleep_ms(400)
+    sleep_ms(50)
 
 
@@ -0,0 +1,129 @@
+from machine import Pin, disable_irq, enable_irq
+from micropython import const
+from utime import sleep_ms
+from rp2 import PIO, asm_pio, StateMachine, DMA
+from array import array
+import uctypes
+
+
+DEFAULT_FREQ = const(2000)              # 125 MHz / 62500, 0.5 ms per cycle
+STEP_OVERHEAD = const(4)                # pull + 2 x out + the final jmp
+MAX_DELAY = const(0xFFFFFF)
+MAX_PINS = const(8)
+
+DMA_READ_ADDR_TRIG = const(15)          # AL3_READ_ADDR_TRIG, register index within a channel
+
+
+def sequencer_program(count):
+    # One step per 32 bit word: pin pattern in the low 8 bits and a delay in cycles
+    # above it, so every step lasts exactly delay + STEP_OVERHEAD cycles
+    @asm_pio(out_init = ((PIO.OUT_LOW, ) * count),
+             out_shiftdir = PIO.SHIFT_RIGHT)
+
+    def timed_output():
+        wrap_target()
+        pull()                  # next step, DMA keeps the TX FIFO topped up
+        out(pins, 8)            # drive the whole group in one go
+        out(x, 24)              # step length
+        label('wait')
+        jmp(x_dec, 'wait')
+        wrap()
+
+    return timed_output
+
+
+class PIO_Sequencer():
+
+    # Plays a table of (pin pattern, duration in ms) steps on a group of consecutive pins.
+    # A data DMA channel feeds the table into the TX FIFO and chains to a control channel
+    # that rewrites its read address, so the table loops without the CPU.
+    def __init__(self, sm_id, base_pin, count, freq = DEFAULT_FREQ):
+        if(count > MAX_PINS):
+            raise ValueError("A sequencer drives at most 8 pins")
+
+        self.freq = freq
+        self.base_pin = base_pin
+        self.program = sequencer_program(count)
+        self.sm = StateMachine(sm_id, self.program, freq = freq, out_base = Pin(base_pin))
+        self.treq = ((sm_id >> 2) << 3) | (sm_id & 3)       # DREQ_PIOx_TXy
+
+        self.table = None
+        self.previous = None
+        self.address = array('I', [0])
+
+        self.data = DMA()
+        self.control = DMA()
+
+
+    def compile(self, steps):
+        words = array('I')
+
+        for pattern, ms in steps:
+            cycles = ((ms * self.freq) // 1000) - STEP_OVERHEAD
+
+            if(cycles < 0):
+                cycles = 0
+            elif(cycles > MAX_DELAY):
+                cycles = MAX_DELAY
+
+            words.append((cycles << 8) | (pattern & 0xFF))
+
+        return words
+
+
+    def start(self, steps):
+        self.stop()
+
+        self.table = self.compile(steps)
+        self.address[0] = uctypes.addressof(self.table)
+
+        ctrl = self.control.pack_ctrl(size = 2, inc_read = False, inc_write = False)
+        self.control.config(read = self.address, write = self.data.registers[DMA_READ_ADDR_TRIG:], count = 1, ctrl = ctrl)
+
+        ctrl = self.data.pack_ctrl(size = 2, inc_read = True, inc_write = False,
+                                   treq_sel = self.treq, chain_to = self.control.channel)
+        self.data.config(read = self.table, write = self.sm, count = len(self.table), ctrl = ctrl)
+
+        # restart() keeps the TX FIFO and the program counter, so steps left over from a
+        # previous table would play first. init() clears the FIFOs and starts from the top.
+        self.sm.init(self.program, freq = self.freq, out_base = Pin(self.base_pin))
+        self.sm.active(1)
+        self.data.active(1)
+
+
+    def update(self, steps):
+        # Takes effect when the running table wraps, the table the DMA is still reading
+        # stays referenced until then. The control channel reloads the address on its own,
+        # so the two writes below are only safe away from a wrap: wait until at least two
+        # transfers are left, which is at least one whole step (>= STEP_OVERHEAD cycles)
+        # since each transfer waits for a pull.
+        table = self.compile(steps)
+
+        while(True):
+            state = disable_irq()
+            if((self.data.count >= 2) or (len(self.table) < 2)):
+                break
+            enable_irq(state)
+            sleep_ms(1)
+
+        start = uctypes.addressof(self.table)
+        if(start <= self.data.read <= (start + (4 * len(self.table)))):
+            self.previous = self.table
+
+        # Should a wrap still land between the writes, order them so the mismatched pair
+        # reads no further than the shorter table: at worst one loop is cut short
+        if(len(table) < len(self.table)):
+            self.data.count = len(table)
+            self.address[0] = uctypes.addressof(table)
+        else:
+            self.address[0] = uctypes.addressof(table)
+            self.data.count = len(table)
+
+        self.table = table
+        enable_irq(state)
+
+
+    def stop(self):
+        self.data.active(0)
+        self.control.active(0)
+        self.sm.active(0)
@@ -0,0 +1,149 @@
+from machine import Pin
+from micropython import const
+from rp2 import asm_pio, StateMachine, PIO
+
+
+WIEGAND_SM_FREQ = const(5000000)        # 5 cycle poll loop -> D0/D1 sampled every 1us
+WIEGAND_TIMEOUT_POLLS = const(31744)    # 31744 polls x 1us ~ 32ms of silence ends a frame
+
+WIEGAND_26 = const(26)
+WIEGAND_34 = const(34)
+WIEGAND_37 = const(37)
+
+
+class Wiegand():
+    
+    # Every bit is stored as a "1b" pair, so each pushed word is self describing: its
+    # leading 1 tells how many bits it holds. A zero word marks the end of a frame.
+    @asm_pio(in_shiftdir = PIO.SHIFT_LEFT, out_shiftdir = PIO.SHIFT_RIGHT, autopush = True, push_thresh = 32, fifo_join = PIO.JOIN_RX)
+    def IO_ops():
+        wrap_target()
+        label("idle")              # no timeout while waiting for the first bit of a frame
+        jmp(pin, "idle_d0")        # D1 high, go and check D0
+        jmp("bit")
+        label("idle_d0")
+        mov(osr, pins)
+        out(x, 1)                  # x = D0
+        jmp(not_x, "bit")
+        jmp("idle")
+        
+        label("bit")
+        set(x, 1)
+        in_(x, 1)                  # pair marker
+        in_(pins, 1)               # D0 level during the pulse is the bit: D0 low = 0, D1 low = 1
+        wait(1, pin, 0)            # wait for both lines to be released
+        wait(1, pin, 1)
+        set(x, 31)
+        mov(osr, reverse(x))       # OSR = 0xF8000000
+        out(null, 17)              # OSR = 31744
+        mov(y, osr)                # y = inter-bit timeout in polls
+        
+        label("gap")
+        jmp(pin, "gap_d0")
+        jmp("bit")
+        label("gap_d0")
+        mov(osr, pins)
+        out(x, 1)
+        jmp(not_x, "bit")
+        jmp(y_dec, "gap")
+        
+        push(noblock)              # timeout: flush the partial word
+        push(noblock)              # then an empty word as the frame delimiter
+        irq(rel(0))
+        wrap()
+        
+        
+    def __init__(self, _d0_pin, _d1_pin, _sm = 0, callback = None):
+        if(_d1_pin != (_d0_pin + 1)):
+            raise ValueError("D1 must be the GPIO right after D0")
+        
+        self.D0_pin = Pin(_d0_pin, Pin.IN, Pin.PULL_UP)
+        self.D1_pin = Pin(_d1_pin, Pin.IN, Pin.PULL_UP)
+        
+        self.callback = callback
+        
+        self.value = 0
+        self.bits = 0
+        self.errors = 0
+        
+        self.sm = StateMachine(_sm, Wiegand.IO_ops, freq = WIEGAND_SM_FREQ, in_base = self.D0_pin, jmp_pin = self.D1_pin)
+        self.sm.irq(self.irq_handler)
+        self.sm.active(1)
+        
+        
+    def unpack(self, word):
+        n = 0
+        while((word >> n) > 1):
+            n += 2
+            
+        for i in range((n - 2), -1, -2):
+            self.value = (self.value << 1) | ((word >> i) & 1)
+            self.bits += 1
+            
+            
+    def parity(self, first, last):
+        ones = 0
+        for i in range(first, (last + 1)):
+            ones += (self.value >> (self.bits - 1 - i)) & 1
+        return (ones & 1)
+    
+    
+    def field(self, first, last):
+        return (self.value >> (self.bits - 1 - last)) & ((1 << (last - first + 1)) - 1)
+    
+    
+    def decode(self):
+        # Returns (facility code, card number) or None when the length or parity is wrong
+        if(self.bits == WIEGAND_26):
+            even = (1, 12)
+            odd = (13, 24)
+            facility = (1, 8)
+            card = (9, 24)
+            
+        elif(self.bits == WIEGAND_34):
+            even = (1, 16)
+            odd = (17, 32)
+            facility = (1, 16)
+            card = (17, 32)
+            
+        elif(self.bits == WIEGAND_37):
+            even = (1, 18)
+            odd = (18, 35)
+            facility = (1, 16)
+            card = (17, 35)
+            
+        else:
+            return None
+        
+        if((self.field(0, 0) ^ self.parity(even[0], even[1])) != 0):
+            return None
+        
+        if((self.field(self.bits - 1, self.bits - 1) ^ self.parity(odd[0], odd[1])) != 1):
+            return None
+        
+        return self.field(facility[0], facility[1]), self.field(card[0], card[1])
+    
+    
+    def irq_handler(self, sm):
+        # Runs once per frame; several queued frames are split on the zero delimiter
+        while(self.sm.rx_fifo() > 0):
+            word = self.sm.get()
+            
+            if(word != 0):
+                self.unpack(word)
+                continue
+            
+            if(self.bits > 0):
+                result = self.decode()
+                
+                if(result == None):
+                    self.errors += 1
+                elif(self.callback != None):
+                    self.callback(result[0], result[1], self.bits)
+                    
+            self.value = 0
+            self.bits = 0
+            
+            
+    def stop(self):
+        self.sm.active(0)
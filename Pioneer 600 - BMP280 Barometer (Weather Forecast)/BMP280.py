@@ -1,5 +1,6 @@
 from micropython import const
 from machine import Pin, I2C
+from utime import sleep_us, sleep_ms
 
 
 BMP280_I2C_ADDRESS              =    const(0x76)          
@@ -47,6 +48,44 @@ BMP280_DIG_P8_MSB_REG    =    const(0x9D)
 BMP280_DIG_P9_LSB_REG      =    const(0x9E)  
 BMP280_DIG_P9_MSB_REG    =    const(0x9F)
 
+BMP280_CALIB_LENGTH              =    const(24)
+BMP280_DATA_LENGTH                =    const(6)
+
+#Power modes (ctrl_meas[1:0])
+BMP280_SLEEP_MODE                  =    const(0x00)
+BMP280_FORCED_MODE                =    const(0x01)
+BMP280_NORMAL_MODE               =    const(0x03)
+
+#Oversampling settings (osrs_t / osrs_p)
+BMP280_OSR_SKIP                     =    const(0x00)
+BMP280_OSR_X1                         =    const(0x01)
+BMP280_OSR_X2                         =    const(0x02)
+BMP280_OSR_X4                         =    const(0x03)
+BMP280_OSR_X8                         =    const(0x04)
+BMP280_OSR_X16                       =    const(0x05)
+
+#IIR filter coefficients (config[4:2])
+BMP280_FILTER_OFF                   =    const(0x00)
+BMP280_FILTER_2                       =    const(0x01)
+BMP280_FILTER_4                       =    const(0x02)
+BMP280_FILTER_8                       =    const(0x03)
+BMP280_FILTER_16                     =    const(0x04)
+
+#Normal mode standby times (config[7:5])
+BMP280_STANDBY_0_5_MS          =    const(0x00)
+BMP280_STANDBY_62_5_MS        =    const(0x01)
+BMP280_STANDBY_125_MS          =    const(0x02)
+BMP280_STANDBY_250_MS          =    const(0x03)
+BMP280_STANDBY_500_MS          =    const(0x04)
+BMP280_STANDBY_1000_MS        =    const(0x05)
+BMP280_STANDBY_2000_MS        =    const(0x06)
+BMP280_STANDBY_4000_MS        =    const(0x07)
+
+BMP280_STATUS_MEASURING       =    const(0x08)
+
+#Number of samples taken for each osrs_x setting
+BMP280_OSR_SAMPLES               =    (0, 1, 2, 4, 8, 16)
+
 ELEVATION                             =    const(4)
 
 
@@ -55,11 +94,13 @@ class BMP280():
         self.i2c = _i2c
         self.i2c_address = BMP280_I2C_ADDRESS
         self.t_fine = 0
+        self.data = bytearray(BMP280_DATA_LENGTH)
+        self.mode = BMP280_NORMAL_MODE
+        self.ctrl_meas = 0x00
         
         if (self.read_byte(BMP280_ID_REG) == BMP280_ID_Value):
             self.load_calibration_data()
-            self.write_byte(BMP280_CTRL_MEAS_REG, 0xFF)
-            self.write_byte(BMP280_CONFIG_REG, 0x14)
+            self.configure()
             
         else:
             print("BMP280 error!")
@@ -92,21 +133,82 @@ class BMP280():
 
     
     def load_calibration_data(self):
+        # All 12 calibration words in one burst, little endian
+        calib = self.i2c.readfrom_mem(self.i2c_address, BMP280_DIG_T1_LSB_REG, BMP280_CALIB_LENGTH)
+        words = []
+        for i in range(0, BMP280_CALIB_LENGTH, 2):
+            value = ((calib[i + 1] << 8) | calib[i])
+            if (i not in (0, 6)) and (value > 32767):
+                value -= 65536
+            words.append(value)
+        
         # Temperature Calibration Parameters
-        self.dig_T1 = self.read_word(BMP280_DIG_T1_LSB_REG)
-        self.dig_T2 = self.read_signed_word(BMP280_DIG_T2_LSB_REG)
-        self.dig_T3 = self.read_signed_word(BMP280_DIG_T3_LSB_REG)
+        self.dig_T1, self.dig_T2, self.dig_T3 = words[0:3]
 
         # Barometeric Pressure Calibration Parameters
-        self.dig_P1 = self.read_word(BMP280_DIG_P1_LSB_REG)
-        self.dig_P2 = self.read_signed_word(BMP280_DIG_P2_LSB_REG)
-        self.dig_P3 = self.read_signed_word(BMP280_DIG_P3_LSB_REG)
-        self.dig_P4 = self.read_signed_word(BMP280_DIG_P4_LSB_REG)
-        self.dig_P5 = self.read_signed_word(BMP280_DIG_P5_LSB_REG)
-        self.dig_P6 = self.read_signed_word(BMP280_DIG_P6_LSB_REG)
-        self.dig_P7 = self.read_signed_word(BMP280_DIG_P7_LSB_REG)
-        self.dig_P8 = self.read_signed_word(BMP280_DIG_P8_LSB_REG)
-        self.dig_P9 = self.read_signed_word(BMP280_DIG_P9_LSB_REG)
+        (self.dig_P1, self.dig_P2, self.dig_P3, self.dig_P4, self.dig_P5,
+         self.dig_P6, self.dig_P7, self.dig_P8, self.dig_P9) = words[3:12]
+         
+         
+    def configure(self, mode = BMP280_NORMAL_MODE, temp_osr = BMP280_OSR_X16, press_osr = BMP280_OSR_X16,
+                  iir_filter = BMP280_FILTER_16, standby = BMP280_STANDBY_0_5_MS):
+        # config is only guaranteed to be written in sleep mode
+        self.write_byte(BMP280_CTRL_MEAS_REG, BMP280_SLEEP_MODE)
+        self.write_byte(BMP280_CONFIG_REG, (((standby & 0x07) << 5) | ((iir_filter & 0x07) << 2)))
+        
+        self.mode = mode
+        self.ctrl_meas = (((temp_osr & 0x07) << 5) | ((press_osr & 0x07) << 2))
+        self.meas_time_us = (1250 + (2300 * BMP280_OSR_SAMPLES[temp_osr]) +
+                             (2300 * BMP280_OSR_SAMPLES[press_osr]) + 575)
+        
+        # Forced mode conversions are triggered by read()
+        if (mode == BMP280_NORMAL_MODE):
+            self.write_byte(BMP280_CTRL_MEAS_REG, (self.ctrl_meas | BMP280_NORMAL_MODE))
+            
+            
+    def trigger_forced(self):
+        self.write_byte(BMP280_CTRL_MEAS_REG, (self.ctrl_meas | BMP280_FORCED_MODE))
+        sleep_us(self.meas_time_us)
+        
+        for _ in range(10):
+            if not (self.read_byte(BMP280_STATUS_REG) & BMP280_STATUS_MEASURING):
+                return True
+            sleep_ms(1)
+        
+        return False
+        
+        
+    def read_raw(self):
+        # None if a forced conversion did not finish, the registers would still hold the last one
+        if (self.mode == BMP280_FORCED_MODE):
+            if (self.trigger_forced() == False):
+                return None
+        
+        # press_msb .. temp_xlsb: both results come from the same conversion
+        self.i2c.readfrom_mem_into(self.i2c_address, BMP280_PRESS_MSB_REG, self.data)
+        d = self.data
+        adc_P = (d[0] << 12) | (d[1] << 4) | (d[2] >> 4)
+        adc_T = (d[3] << 12) | (d[4] << 4) | (d[5] >> 4)
+        
+        return adc_T, adc_P
+    
+    
+    def read(self):
+        raw = self.read_raw()
+        
+        if (raw == None):
+            return None
+        
+        adc_T, adc_P = raw
+        
+        # Temperature first, it updates t_fine for the pressure compensation
+        temperature = self.compensate_temperature(adc_T)
+        pressure = self.compensate_pressure(adc_P)
+        
+        pressure = (pressure / 100.0)
+        pressure =  (pressure + (ELEVATION / 9.2))
+        
+        return temperature, pressure # deg. C, mbar
 
 
     def compensate_temperature(self, adc_T):
@@ -138,28 +240,21 @@ class BMP280():
     
 
     def get_temperature(self):
-        xlsb = self.read_byte(BMP280_TEMP_XLSB_REG)
-        lsb =  self.read_byte(BMP280_TEMP_LSB_REG)
-        msb =  self.read_byte(BMP280_TEMP_MSB_REG)
-
-        adc_T = (msb << 12) | (lsb << 4) | (xlsb >> 4)
-        temperature = self.compensate_temperature(adc_T)
-
-        return temperature # temperature in deg. C
+        reading = self.read()
+        
+        if (reading == None):
+            return None
+        
+        return reading[0] # temperature in deg. C
 
 
     def get_pressure(self):
-        xlsb = self.read_byte(BMP280_PRESS_XLSB_REG)
-        lsb =  self.read_byte(BMP280_PRESS_LSB_REG) 
-        msb =  self.read_byte(BMP280_PRESS_MSB_REG) 
-
-        adc_P = (msb << 12) | (lsb << 4) | (xlsb >> 4)
-        pressure = self.compensate_pressure(adc_P)
+        reading = self.read()
         
-        pressure = (pressure / 100.0)
-        pressure =  (pressure + (ELEVATION / 9.2))
+        if (reading == None):
+            return None
         
-        return pressure #pressure in mbar
+        return reading[1] #pressure in mbar
 
 
 
@@ -78,8 +78,13 @@ sleep_ms(1000)
 
 while True:
     
-    p = bmp.get_pressure()
-    t = bmp.get_temperature()
+    reading = bmp.read()
+    
+    if(reading == None):
+        sleep_ms(100)           # conversion timed out, keep the last frame on screen
+        continue
+    
+    t, p = reading
     
     oled.fill(oled.BLACK)
     
@@ -24,6 +24,12 @@ DS3231_ageoffset_reg = const(0x10)
 DS3231_temp_MSB_reg = const(0x11)
 DS3231_temp_LSB_reg = const(0x12) 
 
+DS3231_control_1HZ_SQW = const(0x00)
+DS3231_control_INTCN = const(0x04)
+
+# Packed BCD byte -> decimal, indexed by the raw register value
+BCD_TO_DECIMAL = bytes([(((i >> 4) * 10) + (i & 0x0F)) for i in range(256)])
+
 
 class DS3231():
     def __init__(self, _i2c):
@@ -35,6 +41,8 @@ class DS3231():
         
         self.i2c = _i2c
         self.i2c_address = DS3231_I2C_Address
+        self.time_buf = bytearray(7)
+        self.temp_buf = bytearray(2)
         self.init()
 
 
@@ -56,16 +64,25 @@ class DS3231():
 
 
     def bcd_to_decimal(self, value):
-        return ((value & 0x0F) + (((value & 0xF0) >> 4) * 10))
+        return BCD_TO_DECIMAL[value & 0xFF]
 
 
     def decimal_to_bcd(self, value):
         return (((value // 10) << 4) & 0xF0) | ((value % 10) & 0x0F)
 
 
+    def read_time_block(self):
+        # Seconds to years in one transaction, so the fields are coherent
+        self.i2c.readfrom_mem_into(self.i2c_address, DS3231_second_reg, self.time_buf)
+        return self.time_buf
+
+
     def get_temperature(self):
-        LB = self.read(DS3231_temp_LSB_reg)
-        HB = self.read(DS3231_temp_MSB_reg)
+        self.i2c.readfrom_mem_into(self.i2c_address, DS3231_temp_MSB_reg, self.temp_buf)
+        HB = self.temp_buf[0]
+        LB = self.temp_buf[1]
+        if(HB & 0x80):
+            HB -= 0x100
         LB >>= 0x06
         LB &= 0x03
         t = LB
@@ -74,33 +91,59 @@ class DS3231():
         return t 
 
     
-    def get_time(self, hour_format):
+    def decode_time(self, buf, hour_format):
         am_pm_state = 0
         
-        second = self.bcd_to_decimal(self.read(DS3231_second_reg))
-        minute = self.bcd_to_decimal(self.read(DS3231_minute_reg))
+        second = BCD_TO_DECIMAL[buf[0] & 0x7F]
+        minute = BCD_TO_DECIMAL[buf[1] & 0x7F]
 
         if(hour_format == self._12_hour_format):
-            tmp = self.read(DS3231_hour_reg)
-            tmp &= 0x20
-            tmp >>= 0x05
-            am_pm_state = tmp
-            hour = self.bcd_to_decimal((self.read(DS3231_hour_reg) & 0x1F)) 
+            am_pm_state = ((buf[2] & 0x20) >> 0x05)
+            hour = BCD_TO_DECIMAL[buf[2] & 0x1F]
 
         else:
-            hour = self.bcd_to_decimal((self.read(DS3231_hour_reg) & 0x3F)) 
+            hour = BCD_TO_DECIMAL[buf[2] & 0x3F]
 
         return hour, minute, second, am_pm_state
 
 
-    def get_calendar(self):
-        year = self.bcd_to_decimal(self.read(DS3231_year_reg))
-        month = self.bcd_to_decimal((self.read(DS3231_month_reg) & 0x1F)) 
-        date = self.bcd_to_decimal((self.read(DS3231_date_reg) & 0x3F))
-        day = self.bcd_to_decimal((self.read(DS3231_day_reg) & 0x07))
+    def decode_calendar(self, buf):
+        day = BCD_TO_DECIMAL[buf[3] & 0x07]
+        date = BCD_TO_DECIMAL[buf[4] & 0x3F]
+        month = BCD_TO_DECIMAL[buf[5] & 0x1F]
+        year = BCD_TO_DECIMAL[buf[6]]
 
         return day, date, month, year
 
+    
+    def get_time(self, hour_format):
+        return self.decode_time(self.read_time_block(), hour_format)
+
+
+    def get_calendar(self):
+        return self.decode_calendar(self.read_time_block())
+
+
+    def get(self, hour_format):
+        buf = self.read_time_block()
+        hour, minute, second, am_pm_state = self.decode_time(buf, hour_format)
+        day, date, month, year = self.decode_calendar(buf)
+        
+        return hour, minute, second, am_pm_state, day, date, month, year
+
+
+    def enable_second_tick(self, pin, handler):
+        # 1 Hz square wave on INT/SQW (open drain) into a pin IRQ, so callers
+        # only read and redraw when the seconds actually change
+        self.write(DS3231_control_reg, DS3231_control_1HZ_SQW)
+        pin.init(Pin.IN, Pin.PULL_UP)
+        pin.irq(trigger = Pin.IRQ_FALLING, handler = handler)
+
+
+    def disable_second_tick(self, pin):
+        pin.irq(handler = None)
+        self.write(DS3231_control_reg, DS3231_control_INTCN)
+
 
     def set_time(self, hour, minute, second, am_pm_state, hour_format):
         self.write(DS3231_second_reg, self.decimal_to_bcd(second))
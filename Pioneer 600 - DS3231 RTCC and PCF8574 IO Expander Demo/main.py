@@ -3,6 +3,10 @@ from SSD1306_I2C import OLED1306
 from DS3231 import DS3231
 from PCF8574 import PCF8574
 from utime import sleep_ms
+from micropython import const
+
+
+RTC_SQW = const(6)
 
 
 i = 0
@@ -18,6 +22,7 @@ hour = 23
 minute = 59
 second = 45
 am_pm_state = 1
+second_tick = True
 
 
 LED = Pin(25, Pin.OUT)
@@ -30,6 +35,15 @@ rtc.set_calendar(day, date, month, year)
 rtc.set_time(hour, minute, second, am_pm_state, rtc._24_hour_format)
 
 
+def tick_handler(pin):
+    global second_tick
+    
+    second_tick = True
+
+
+rtc.enable_second_tick(Pin(RTC_SQW), tick_handler)
+
+
 def read_keys():
     global kbd
     
@@ -101,11 +115,9 @@ def rtc_display():
 def get_time():
     global hour, minute, second, am_pm_state, day, date, month, year
     
-    day, date, month, year = rtc.get_calendar()
-    hour, minute, second, am_pm_state = rtc.get_time(rtc._24_hour_format)
+    hour, minute, second, am_pm_state, day, date, month, year = rtc.get(rtc._24_hour_format)
     
     io.pin_toggle(4)
-    sleep_ms(500)
     
     
 def set_time():
@@ -161,8 +173,15 @@ def set_time():
 
 
 while True:
-    oled.fill(oled.BLACK)
     read_keys()
+    
+    # Outside set mode the screen is only rebuilt when the RTC ticks
+    if((set_read == 0) and (kbd != 0x0B) and (second_tick == False)):
+        sleep_ms(10)
+        continue
+    
+    second_tick = False
+    oled.fill(oled.BLACK)
     select_mode()
     rtc_display()  
     
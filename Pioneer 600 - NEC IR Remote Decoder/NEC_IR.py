@@ -0,0 +1,120 @@
+from machine import Pin
+from micropython import const
+from rp2 import asm_pio, StateMachine, PIO
+from utime import ticks_ms, ticks_diff
+
+
+NEC_SM_FREQ = const(100000)             # 10us per PIO cycle
+
+NEC_REPEAT_WORD = const(-1)             # pushed as 0xFFFFFFFF, never a valid NEC frame
+NEC_REPEAT_TIMEOUT_MS = const(150)      # repeats arrive every 108ms while a key is held
+
+PROTOCOL_NEC = const(0)
+PROTOCOL_NEC_EXT = const(1)
+PROTOCOL_OTHER = const(2)
+
+
+class NEC_IR():
+    
+    @asm_pio(in_shiftdir = PIO.SHIFT_RIGHT, autopush = True, push_thresh = 32)
+    def IO_ops():
+        wrap_target()
+        label("idle")
+        wait(0, pin, 0)            # receiver output is active low, wait for a mark
+        set(x, 31)                 # mark must stay low for 32 x 120us = 3.84ms to be a header
+        label("header")
+        jmp(pin, "idle")           # released too early, noise or a data bit
+        jmp(x_dec, "header") [10]
+        
+        wait(1, pin, 0)            # end of header mark
+        set(x, 24)                 # sample the space 2.5ms in
+        label("space")
+        jmp(x_dec, "space") [9]
+        jmp(pin, "data")           # still high: 4.5ms space, data frame follows
+        
+        mov(isr, invert(null))     # low again: 2.25ms space, repeat code
+        push(noblock)
+        irq(rel(0))
+        jmp("idle")
+        
+        label("data")
+        set(y, 31)
+        label("bit")
+        wait(0, pin, 0)            # 560us mark
+        wait(1, pin, 0)
+        set(x, 7)                  # sample 820us into the space: high = 1, next mark = 0
+        label("bit_delay")
+        jmp(x_dec, "bit_delay") [9]
+        in_(pins, 1)               # LSB first, autopush after 32 bits
+        jmp(y_dec, "bit")
+        irq(rel(0))
+        wrap()
+        
+        
+    def __init__(self, _ir_pin, _sm = 0, callback = None):
+        self.IR_pin = Pin(_ir_pin, Pin.IN, Pin.PULL_UP)
+        
+        self.handlers = {}
+        self.callback = callback
+        
+        self.last_address = -1
+        self.last_command = -1
+        self.last_ms = 0
+        self.last_word = 0                  # raw frame, LSB = first byte sent
+        self.protocol = PROTOCOL_NEC
+        
+        self.sm = StateMachine(_sm, NEC_IR.IO_ops, freq = NEC_SM_FREQ, in_base = self.IR_pin, jmp_pin = self.IR_pin)
+        self.sm.irq(self.irq_handler)
+        self.sm.active(1)
+        
+        
+    def on(self, address, command, callback):
+        self.handlers[(address, command)] = callback
+        
+        
+    def on_any(self, callback):
+        self.callback = callback
+        
+        
+    def decode(self, word):
+        b0 = word & 0xFF
+        b1 = (word >> 8) & 0xFF
+        b2 = (word >> 16) & 0xFF
+        b3 = (word >> 24) & 0xFF
+        
+        if((b2 ^ b3) != 0xFF):
+            return (word & 0xFFFF), (word >> 16), PROTOCOL_OTHER
+        
+        if((b0 ^ b1) == 0xFF):
+            return b0, b2, PROTOCOL_NEC
+        
+        return (b0 | (b1 << 8)), b2, PROTOCOL_NEC_EXT
+    
+    
+    def dispatch(self, address, command, repeat):
+        handler = self.handlers.get((address, command), self.callback)
+        
+        if(handler != None):
+            handler(address, command, repeat)
+            
+            
+    def irq_handler(self, sm):
+        # Runs only when the PIO program has finished a frame or a repeat code
+        while(self.sm.rx_fifo() > 0):
+            word = self.sm.get()
+            now = ticks_ms()
+            
+            if(word == (NEC_REPEAT_WORD & 0xFFFFFFFF)):
+                if((self.last_command >= 0) and (ticks_diff(now, self.last_ms) < NEC_REPEAT_TIMEOUT_MS)):
+                    self.last_ms = now
+                    self.dispatch(self.last_address, self.last_command, True)
+                continue
+            
+            self.last_word = word
+            self.last_address, self.last_command, self.protocol = self.decode(word)
+            self.last_ms = now
+            self.dispatch(self.last_address, self.last_command, False)
+            
+            
+    def stop(self):
+        self.sm.active(0)
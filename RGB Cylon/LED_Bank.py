@@ -0,0 +1,88 @@
+from machine import Pin, Timer, mem32
+from micropython import const
+from array import array
+
+
+SIO_BASE = const(0xD0000000)
+SIO_GPIO_OUT = const(0x010)
+SIO_GPIO_OUT_XOR = const(0x01C)
+
+
+class LED_Bank():
+
+    # A group of LEDs on arbitrary GPIOs. Patterns are bitmasks with bit i for LED i,
+    # turned into GPIO words once, and shown with a single write to the SIO XOR register
+    # so every LED changes on the same clock and pins outside the bank are left alone.
+    def __init__(self, pins, active_low = False):
+        self.pins = pins
+        self.active_low = active_low
+        self.mask = 0
+
+        for p in pins:
+            Pin(p, Pin.OUT)
+            self.mask |= (1 << p)
+
+        self.timer = None
+        self.sequence = None
+        self.durations = None
+        self.step = 0
+
+        self.show(self.word(0))
+
+
+    def word(self, bits):
+        value = 0
+
+        for i in range(0, len(self.pins)):
+            if(bits & (1 << i)):
+                value |= (1 << self.pins[i])
+
+        if(self.active_low):
+            value ^= self.mask
+
+        return value
+
+
+    def compile(self, patterns):
+        return array('I', [self.word(bits) for bits in patterns])
+
+
+    def show(self, word):
+        mem32[SIO_BASE + SIO_GPIO_OUT_XOR] = (mem32[SIO_BASE + SIO_GPIO_OUT] ^ word) & self.mask
+
+
+    def show_bits(self, bits):
+        self.show(self.word(bits))
+
+
+    def play(self, sequence, durations):
+        # Step through compiled words from a one-shot timer, durations in ms per step
+        self.stop()
+        self.sequence = sequence
+        self.durations = durations
+        self.step = 0
+
+        # A fresh timer per run: a callback already scheduled by the previous one
+        # carries the old timer and is ignored below instead of stepping this run
+        self.timer = Timer()
+        self.timer_handler(self.timer)
+
+
+    def timer_handler(self, timer):
+        if((timer is not self.timer) or (self.sequence == None)):
+            return
+
+        self.show(self.sequence[self.step])
+        self.timer.init(mode = Timer.ONE_SHOT, period = self.durations[self.step], callback = self.timer_handler)
+
+        self.step += 1
+        if(self.step >= len(self.sequence)):
+            self.step = 0
+
+
+    def stop(self):
+        if(self.timer != None):
+            self.timer.deinit()
+
+        self.timer = None
+        self.sequence = None
@@ -0,0 +1,83 @@
+from machine import Timer
+from micropython import const
+from array import array
+import math
+
+
+LUT_SIZE = const(256)
+LUT_SHIFT = const(8)
+DEFAULT_RATE = const(100)               # duty updates per second
+
+
+def make_curve(fn):
+    # 256 entry Q16 LUT of an easing function mapping 0..1 onto 0..1
+    return array('H', [int(fn(i / (LUT_SIZE - 1)) * 65535) for i in range(0, LUT_SIZE)])
+
+
+LINEAR = make_curve(lambda t : t)
+SINE = make_curve(lambda t : (1 - math.cos(math.pi * t)) / 2)
+BREATHE = make_curve(lambda t : (math.exp(math.sin(math.pi * t - (math.pi / 2))) - 0.36788) / 2.3504)
+GAMMA = make_curve(lambda t : math.pow(t, 2.2))
+
+
+class PWM_Sequencer():
+
+    # Keyframes are expanded into one duty per channel per tick when loaded, so the timer
+    # callback only indexes the tables: the cost per tick is the same for any effect
+    def __init__(self, pwms, rate = DEFAULT_RATE):
+        self.pwms = pwms
+        self.rate = rate
+        self.timer = Timer()
+        self.frames = None
+        self.index = 0
+
+
+    def load(self, keyframes, curve = LINEAR, gamma = None):
+        # keyframes: [(fade_ms, (duty, duty, ...)), ...], each fading into the next and the
+        # last one back into the first; gamma is an optional output LUT such as GAMMA
+        channels = len(self.pwms)
+        frames = [array('H') for c in range(0, channels)]
+
+        for k in range(0, len(keyframes)):
+            fade_ms, start = keyframes[k]
+            end = keyframes[(k + 1) % len(keyframes)][1]
+            steps = (fade_ms * self.rate) // 1000
+
+            if(steps < 1):
+                steps = 1
+
+            for s in range(0, steps):
+                w = curve[(s << LUT_SHIFT) // steps]
+
+                for c in range(0, channels):
+                    value = start[c] + (((end[c] - start[c]) * w) >> 16)
+
+                    if(gamma != None):
+                        value = gamma[value >> LUT_SHIFT]
+
+                    frames[c].append(value)
+
+        # Swapped in with one assignment so a running timer never sees a half built table
+        self.index = 0
+        self.frames = frames
+
+
+    def start(self):
+        self.timer.init(freq = self.rate, mode = Timer.PERIODIC, callback = self.timer_handler)
+
+
+    def timer_handler(self, timer):
+        frames = self.frames
+        i = self.index
+
+        if(i >= len(frames[0])):
+            i = 0
+
+        for c in range(0, len(self.pwms)):
+            self.pwms[c].duty_u16(frames[c][i])
+
+        self.index = i + 1
+
+
+    def stop(self):
+        self.timer.deinit()
@@ -1,19 +1,16 @@
 from micropython import const
 from machine import Pin, PWM
-from utime import sleep_ms, sleep_us
+from utime import sleep_ms
+from LED_Bank import LED_Bank
+from PWM_Sequencer import PWM_Sequencer, SINE, BREATHE, GAMMA
 
 
 sleep_time = const(60)
 
+BREATHING = False               # True: slow gamma corrected breathing instead of the colour wheel
 
-D0 = Pin(1, Pin.OUT)
-D1 = Pin(3, Pin.OUT)
-D2 = Pin(5, Pin.OUT)
-D3 = Pin(6, Pin.OUT)
-D4 = Pin(7, Pin.OUT)
-D5 = Pin(8, Pin.OUT)
-D6 = Pin(9, Pin.OUT)
-D7 = Pin(10, Pin.OUT)
+
+leds = LED_Bank([1, 3, 5, 6, 7, 8, 9, 10], active_low = True)
 
 pwm1 = PWM(Pin(0))
 pwm1.freq(9000)
@@ -24,129 +21,31 @@ pwm2.freq(9000)
 pwm3 = PWM(Pin(4))
 pwm3.freq(9000)
 
+rgb = PWM_Sequencer([pwm1, pwm2, pwm3], 100)
+
 
 r_duty = [12043, 23676, 34503, 44155, 52302, 58668, 63036, 65256, 65254, 63028, 58656, 52286, 44135, 34481, 23652, 12017]
 g_duty = [58668, 63036, 65256, 65254, 63028, 58656, 52286, 44135, 34481, 23652, 12017, 12043, 23676, 34503, 44155, 52302]
 b_duty = [58656, 52286, 44135, 34481, 23652, 12017, 12043, 23676, 34503, 44155, 52302, 58668, 63036, 65256, 65254, 63028]
 
 
-def level(value):
-    if(value == 8):
-        D0.low()
-        D1.high()
-        D2.high()
-        D3.high()
-        D4.high()
-        D5.high()
-        D6.high()
-        D7.high()
-    
-    elif(value == 7):
-        D0.high()
-        D1.low()
-        D2.high()
-        D3.high()
-        D4.high()
-        D5.high()
-        D6.high()
-        D7.high()
-        
-    elif(value == 6):
-        D0.high()
-        D1.high()
-        D2.low()
-        D3.high()
-        D4.high()
-        D5.high()
-        D6.high()
-        D7.high()
-        
-    elif(value == 5):
-        D0.high()
-        D1.high()
-        D2.high()
-        D3.low()
-        D4.high()
-        D5.high()
-        D6.high()
-        D7.high()
-        
-    elif(value == 4):
-        D0.high()
-        D1.high()
-        D2.high()
-        D3.high()
-        D4.low()
-        D5.high()
-        D6.high()
-        D7.high()
-        
-    elif(value == 3):
-        D0.high()
-        D1.high()
-        D2.high()
-        D3.high()
-        D4.high()
-        D5.low()
-        D6.high()
-        D7.high()
-        
-    elif(value == 2):
-        D0.high()
-        D1.high()
-        D2.high()
-        D3.high()
-        D4.high()
-        D5.high()
-        D6.low()
-        D7.high()
-        
-    elif(value == 1):
-        D0.high()
-        D1.high()
-        D2.high()
-        D3.high()
-        D4.high()
-        D5.high()
-        D6.high()
-        D7.low()
-        
-    else:
-        D0.high()
-        D1.high()
-        D2.high()
-        D3.high()
-        D4.high()
-        D5.high()
-        D6.high()
-        D7.high()
+# levels_bits[0] is all off, levels_bits[8] lights D0 down to levels_bits[1] lighting D7
+levels_bits = [0] + [(1 << (8 - v)) for v in range(1, 9)]
 
         
+# One cylon sweep: bar position and colour wheel index for each 60 ms step
+sweep_levels = [4, 5, 6, 7, 8, 8, 7, 6, 5, 4, 3, 2, 1, 0, 1, 2, 3, 4]
+sweep_colours = [3, 4, 5, 6, 7, 7, 8, 9, 10, 11, 12, 13, 14, 15, 0, 1, 2, 3]
+
+leds.play(leds.compile([levels_bits[i] for i in sweep_levels]), ([sleep_time] * len(sweep_levels)))
+
+if(BREATHING):
+    rgb.load([(1500, (0, 0, 0)), (1500, (65535, 20000, 50000))], BREATHE, GAMMA)
+else:
+    rgb.load([(sleep_time, (r_duty[i], g_duty[i], b_duty[i])) for i in sweep_colours], SINE)
+    
+rgb.start()
+
+
 while(True):
-    for i in range(4, 9, 1):
-        level(i)
-        pwm1.duty_u16(r_duty[(i - 1)])
-        pwm2.duty_u16(g_duty[(i - 1)])
-        pwm3.duty_u16(b_duty[(i - 1)])
-        sleep_ms(sleep_time)
-        
-    for i in range(8, 4, -1):
-        level(i)
-        pwm1.duty_u16(r_duty[(15 - i)])
-        pwm2.duty_u16(g_duty[(15 - i)])
-        pwm3.duty_u16(b_duty[(15 - i)])
-        sleep_ms(sleep_time)
-        
-    for i in range(4, -1, -1):
-        level(i)
-        pwm1.duty_u16(r_duty[(15 - i)])
-        pwm2.duty_u16(g_duty[(15 - i)])
-        pwm3.duty_u16(b_duty[(15 - i)])
-        sleep_ms(sleep_time)
-        
-    for i in range(1, 5, 1):
-        level(i)
-        pwm1.duty_u16(r_duty[(i - 1)])
-        pwm2.duty_u16(g_duty[(i - 1)])
-        pwm3.duty_u16(b_duty[(i - 1)])
-        sleep_ms(sleep_time)
+    sleep_ms(1000)
@@ -0,0 +1,67 @@
+from CRC import crc8, crc16_modbus, check_crc8_word, check_crc16_modbus
+from utime import ticks_us, ticks_diff
+
+
+RUNS = 1000
+
+sensirion_frame = bytearray([0x66, 0x66, 0x93, 0x80, 0x00, 0xA2])
+modbus_frame = bytearray([0x01, 0x03, 0x02, 0x00, 0x64, 0xB9, 0xAF])
+
+
+def bitwise_crc8(buffer):
+    crc = 0xFF
+    for byte in buffer:
+        crc ^= byte
+        for _ in range(8):
+            if(crc & 0x80):
+                crc = ((crc << 1) ^ 0x31)
+            else:
+                crc = (crc << 1)
+    return (crc & 0xFF)
+
+
+def bitwise_crc16(value, length):
+    crc_word = 0xFFFF
+    for s in range(length):
+        crc_word ^= value[s]
+        for _ in range(8):
+            if((crc_word & 0x0001) == 0):
+                crc_word >>= 1
+            else:
+                crc_word >>= 1
+                crc_word ^= 0xA001
+    return crc_word
+
+
+def run(name, func):
+    t0 = ticks_us()
+    for _ in range(RUNS):
+        func()
+    print("{:<32}{:>8.1f} us/frame".format(name, ticks_diff(ticks_us(), t0) / RUNS))
+
+
+def sensirion_bitwise():
+    return ((bitwise_crc8(sensirion_frame[0:2]) == sensirion_frame[2]) and (bitwise_crc8(sensirion_frame[3:5]) == sensirion_frame[5]))
+
+
+def sensirion_table():
+    return (check_crc8_word(sensirion_frame, 0) and check_crc8_word(sensirion_frame, 3))
+
+
+def modbus_bitwise():
+    crc = bitwise_crc16(modbus_frame, 5)
+    return (crc == ((modbus_frame[6] << 8) | modbus_frame[5]))
+
+
+def modbus_table():
+    return check_crc16_modbus(modbus_frame, 5)
+
+
+assert sensirion_bitwise() and sensirion_table()
+assert modbus_bitwise() and modbus_table()
+
+print("Per-frame CRC verification cost, {} runs".format(RUNS))
+run("Sensirion T+RH, bitwise", sensirion_bitwise)
+run("Sensirion T+RH, table", sensirion_table)
+run("Modbus 7 byte reply, bitwise", modbus_bitwise)
+run("Modbus 7 byte reply, table", modbus_table)
@@ -1,6 +1,7 @@
 from micropython import const
 from struct import unpack_from
 from utime import sleep_us,sleep_ms
+from CRC import crc8, check_crc8_word
 
 
 SHTC3_I2C_ADDRESS = const(0x70)
@@ -31,6 +32,9 @@ SHTC3_MEAS = [SHTC3_NORMAL_MEAS, SHTC3_LOW_POWER_MEAS]
 SHTC3_MEAS_STRETCH = [SHTC3_NORMAL_MEAS_STRETCH, SHTC3_LOW_POWER_MEAS_STRETCH]
 SHTC3_MEAS_ALL = [SHTC3_MEAS, SHTC3_MEAS_STRETCH]
 
+SHTC3_NORMAL_MEAS_TIME_MS = const(14)
+SHTC3_LOW_POWER_MEAS_TIME_MS = const(2)
+
 
 class SHTC3():    
     
@@ -45,15 +49,7 @@ class SHTC3():
 
     @staticmethod
     def crc8(buffer: bytearray) -> int:
-        crc = 0xFF
-        for byte in buffer:
-            crc ^= byte
-            for _ in range(0, 8, 1):
-                if(crc & 0x80):
-                    crc = ((crc << 1) ^ 0x31)
-                else:
-                    crc = (crc << 1)
-        return (crc & 0xFF) 
+        return crc8(buffer)
     
     
     def write_command(self, command:int):
@@ -79,33 +75,38 @@ class SHTC3():
 
     def read_ID(self):
         self.write_command(SHTC3_REG_READ_ID)
-        self.buffer=self.i2c.readfrom(SHTC3_I2C_ADDRESS, 3)
+        self.i2c.readfrom_into(SHTC3_I2C_ADDRESS, memoryview(self.buffer)[0:3])
         id = ((self.buffer[0] << 8) | self.buffer[1])
         
         return id
 
 
-    def measure(self, low_power_meas = False, clk_stretch = False):
-        command = SHTC3_MEAS_ALL[clk_stretch][low_power_meas][False]
+    def start_measurement(self, low_power_meas = False):
+        command = SHTC3_MEAS_ALL[False][low_power_meas][False]
         self.write_command(command)
-        
-        if(low_power_meas == True):
-            sleep_ms(2)
-        else:
-            sleep_ms(14)
-            
-        self.buffer=self.i2c.readfrom(SHTC3_I2C_ADDRESS, 6)
-        temp_data = self.buffer[0:2]
-        temp_data_crc = self.buffer[2]
-        hum_data = self.buffer[3:5]
-        hum_data_crc = self.buffer[5]
 
-        if((temp_data_crc != self.crc8(temp_data)) or (hum_data_crc != self.crc8(hum_data))):
+
+    def read_measurement(self):
+        self.i2c.readfrom_into(SHTC3_I2C_ADDRESS, self.buffer)
+
+        if((not check_crc8_word(self.buffer, 0)) or (not check_crc8_word(self.buffer, 3))):
             print("crc error")
             return (0, 0)
         else :
-            T_RAW = ((temp_data[0] << 8) | temp_data[1])
-            RH_RAW = ((hum_data[0] << 8) | hum_data[1])
+            T_RAW = ((self.buffer[0] << 8) | self.buffer[1])
+            RH_RAW = ((self.buffer[3] << 8) | self.buffer[4])
             t = ((T_RAW * 175.0) / 65536.0) - 45.0
             rh = ((RH_RAW * 100.0) / 65536.0) 
-            return (t, rh)
\ No newline at end of file
+            return (t, rh)
+
+
+    def measure(self, low_power_meas = False, clk_stretch = False):
+        command = SHTC3_MEAS_ALL[clk_stretch][low_power_meas][False]
+        self.write_command(command)
+        
+        if(low_power_meas == True):
+            sleep_ms(SHTC3_LOW_POWER_MEAS_TIME_MS)
+        else:
+            sleep_ms(SHTC3_NORMAL_MEAS_TIME_MS)
+            
+        return self.read_measurement()
\ No newline at end of file
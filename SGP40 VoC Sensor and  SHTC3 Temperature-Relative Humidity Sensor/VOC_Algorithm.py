@@ -2,6 +2,20 @@
 The fixed point arithmetic parts of this code were originally created by
 https://github.com/PetteriAimonen/libfixmath
 '''
+import struct
+
+
+'''
+Layout of the persisted algorithm state: magic, version, the two
+initialisation flags and 13 fix16 values (uptime, sraw, mean variance
+estimator, mox model and adaptive lowpass filter).
+'''
+VOC_STATE_MAGIC = 0x5643
+VOC_STATE_VERSION = 1
+VOC_STATE_FORMAT = "<HBBB13i"
+VOC_STATE_SIZE = struct.calcsize(VOC_STATE_FORMAT)
+
+
 class VOC_Algorithm():
     '''
     Initialize the VOC algorithm parameters. Call this once at the beginning or
@@ -559,7 +573,56 @@ class VOC_Algorithm():
                 (self.m_Mean_Variance_Estimator___Mean + self.m_Mean_Variance_Estimator___Sraw_Offset))
 
             return self.fix16_cast_to_int(self.mVoc_Index + self.F16(0.5))
-        
-
 
+    '''
+    Serialise the learned algorithm state into a compact bytes blob.
+    Store it in flash and hand it back to set_state() after a reboot
+    to skip the initial blackout and the mean/variance learning phase.
+    '''
+    def get_state(self):
+        return struct.pack(VOC_STATE_FORMAT,
+                           VOC_STATE_MAGIC,
+                           VOC_STATE_VERSION,
+                           bool(self.m_Mean_Variance_Estimator___Initialized),
+                           bool(self.m_Adaptive_Lowpass___Initialized),
+                           self.mUptime,
+                           self.mSraw,
+                           self.m_Mean_Variance_Estimator___Mean,
+                           self.m_Mean_Variance_Estimator___Sraw_Offset,
+                           self.m_Mean_Variance_Estimator___Std,
+                           self.m_Mean_Variance_Estimator___Uptime_Gamma,
+                           self.m_Mean_Variance_Estimator___Uptime_Gating,
+                           self.m_Mean_Variance_Estimator___Gating_Duration_Minutes,
+                           self.m_Mox_Model__Sraw_Std,
+                           self.m_Mox_Model__Sraw_Mean,
+                           self.m_Adaptive_Lowpass___X1,
+                           self.m_Adaptive_Lowpass___X2,
+                           self.m_Adaptive_Lowpass___X3)
 
+    '''
+    Restore a state blob produced by get_state(). Raises ValueError if the
+    blob is truncated or was written by an incompatible layout.
+    '''
+    def set_state(self, blob):
+        if len(blob) < VOC_STATE_SIZE:
+            raise ValueError("VOC state blob too short")
+
+        values = struct.unpack_from(VOC_STATE_FORMAT, blob)
+        if values[0] != VOC_STATE_MAGIC or values[1] != VOC_STATE_VERSION:
+            raise ValueError("Invalid VOC state blob")
+
+        self.m_Mean_Variance_Estimator___Initialized = bool(values[2])
+        self.m_Adaptive_Lowpass___Initialized = bool(values[3])
+        (self.mUptime,
+         self.mSraw,
+         self.m_Mean_Variance_Estimator___Mean,
+         self.m_Mean_Variance_Estimator___Sraw_Offset,
+         self.m_Mean_Variance_Estimator___Std,
+         self.m_Mean_Variance_Estimator___Uptime_Gamma,
+         self.m_Mean_Variance_Estimator___Uptime_Gating,
+         self.m_Mean_Variance_Estimator___Gating_Duration_Minutes,
+         self.m_Mox_Model__Sraw_Std,
+         self.m_Mox_Model__Sraw_Mean,
+         self.m_Adaptive_Lowpass___X1,
+         self.m_Adaptive_Lowpass___X2,
+         self.m_Adaptive_Lowpass___X3) = values[4:]
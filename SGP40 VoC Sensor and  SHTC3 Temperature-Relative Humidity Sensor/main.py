@@ -1,9 +1,30 @@
 from machine import Pin, I2C, SoftI2C
-from SHTC3 import SHTC3
-from SGP40 import SGP40
+from SHTC3 import SHTC3, SHTC3_NORMAL_MEAS_TIME_MS
+from SGP40 import SGP40, SGP40_MEAS_TIME_MS
 from SSD1306_mini import OLED96
 from VOC_Algorithm import VOC_Algorithm
-from utime import sleep_ms
+from utime import sleep_ms, ticks_ms, ticks_diff
+import os
+
+
+VOC_STATE_FILE = "voc_state.bin"
+VOC_STATE_SAVE_INTERVAL_MS = 600000
+SAMPLE_PERIOD_MS = 1000
+
+
+def load_voc_state(voc):
+    try:
+        with open(VOC_STATE_FILE, "rb") as f:
+            voc.set_state(f.read())
+        print("VOC state restored")
+    except (OSError, ValueError):
+        print("No valid VOC state, learning from scratch")
+
+
+def save_voc_state(voc):
+    with open(VOC_STATE_FILE + ".tmp", "wb") as f:
+        f.write(voc.get_state())
+    os.rename(VOC_STATE_FILE + ".tmp", VOC_STATE_FILE)
 
 
 sht_i2c = SoftI2C(scl = Pin(5, Pin.IN, Pin.PULL_UP), sda = Pin(4, Pin.IN, Pin.PULL_UP), freq = 400000)
@@ -15,15 +36,47 @@ sht = SHTC3(sht_i2c)
 oled = OLED96(oled_i2c)
 sgp = SGP40(sgp_i2c)
 voc = VOC_Algorithm()
+load_voc_state(voc)
+last_save = ticks_ms()
+
+
+# SGP40 defaults for humidity compensation until the first SHTC3 result arrives
+t = 25.0
+rh = 50.0
+next_cycle = ticks_ms()
 
 
-while(True):    
-    t, rh = sht.measure()
-    raw_voc = sgp.raw_measurement(t, rh)
+while(True):
+    # Both conversions run in parallel on their own buses: the SGP40 is
+    # compensated with the previous cycle's T/RH and the SHTC3 result is
+    # collected while the SGP40 is still converting.
+    t0 = ticks_ms()
+    sgp.start_raw_measurement(t, rh)
+    sht.start_measurement()
+    sleep_ms(SHTC3_NORMAL_MEAS_TIME_MS)
+    t_new, rh_new = sht.read_measurement()
+    if((t_new, rh_new) != (0, 0)):
+        t, rh = t_new, rh_new
+    
+    remaining = SGP40_MEAS_TIME_MS - ticks_diff(ticks_ms(), t0)
+    if(remaining > 0):
+        sleep_ms(remaining)
+    raw_voc = sgp.read_raw_measurement()
     voc.value = voc.VocAlgorithm_process(raw_voc)
+    
     oled.fill(oled.BLACK)
     oled.text("Tmp/'C :" + str("%3.2f" %t), 1, 4, oled.WHITE)
     oled.text("R.H./% :" + str("%3.2f" %rh), 1, 14, oled.WHITE)
     oled.text("VoC/ppm:" + str("%3.2f" %voc.value), 1, 24, oled.WHITE)
     oled.show()
-    sleep_ms(900)
\ No newline at end of file
+    
+    if(ticks_diff(ticks_ms(), last_save) >= VOC_STATE_SAVE_INTERVAL_MS):
+        save_voc_state(voc)
+        last_save = ticks_ms()
+    
+    next_cycle += SAMPLE_PERIOD_MS
+    remaining = ticks_diff(next_cycle, ticks_ms())
+    if(remaining > 0):
+        sleep_ms(remaining)
+    else:
+        next_cycle = ticks_ms()
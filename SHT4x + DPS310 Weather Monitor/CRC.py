@@ -0,0 +1,77 @@
+from micropython import const
+from array import array
+
+
+# Sensirion CRC-8: polynomial x^8 + x^5 + x^4 + 1, init 0xFF, no reflection
+CRC8_SENSIRION_POLY = const(0x31)
+CRC8_SENSIRION_INIT = const(0xFF)
+
+# Modbus RTU CRC-16: reflected polynomial 0xA001, init 0xFFFF, sent LSB first
+CRC16_MODBUS_POLY = const(0xA001)
+CRC16_MODBUS_INIT = const(0xFFFF)
+
+
+def _make_crc8_table(poly):
+    table = bytearray(256)
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            if(crc & 0x80):
+                crc = (((crc << 1) ^ poly) & 0xFF)
+            else:
+                crc = ((crc << 1) & 0xFF)
+        table[i] = crc
+    return table
+
+
+def _make_crc16_table(poly):
+    table = array('H', bytes(512))
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            if(crc & 0x0001):
+                crc = ((crc >> 1) ^ poly)
+            else:
+                crc >>= 1
+        table[i] = crc
+    return table
+
+
+# Tables are built once at import; every lookup afterwards is one index per byte
+CRC8_TABLE = _make_crc8_table(CRC8_SENSIRION_POLY)
+CRC16_TABLE = _make_crc16_table(CRC16_MODBUS_POLY)
+
+
+'''
+All functions take any indexable buffer (bytes, bytearray, memoryview)
+plus start/end offsets, so fields inside a receive frame can be checked in
+place without slicing. Pass a previous result back in as crc to continue
+a running CRC over data that arrives in several pieces.
+'''
+def crc8(buf, start = 0, end = None, crc = CRC8_SENSIRION_INIT):
+    table = CRC8_TABLE
+    if(end is None):
+        end = len(buf)
+    for i in range(start, end):
+        crc = table[crc ^ buf[i]]
+    return crc
+
+
+def crc16_modbus(buf, start = 0, end = None, crc = CRC16_MODBUS_INIT):
+    table = CRC16_TABLE
+    if(end is None):
+        end = len(buf)
+    for i in range(start, end):
+        crc = ((crc >> 8) ^ table[(crc ^ buf[i]) & 0xFF])
+    return crc
+
+
+def check_crc8_word(buf, offset = 0):
+    # Sensirion word layout: MSB, LSB, CRC
+    return (CRC8_TABLE[CRC8_TABLE[CRC8_SENSIRION_INIT ^ buf[offset]] ^ buf[offset + 1]] == buf[offset + 2])
+
+
+def check_crc16_modbus(buf, length):
+    # The CRC occupies the two bytes following the first length bytes, LSB first
+    crc = crc16_modbus(buf, 0, length)
+    return (((crc & 0xFF) == buf[length]) and ((crc >> 8) == buf[length + 1]))
@@ -16,6 +16,8 @@ DPS310_REG_PRS_CFG = const(0x06)
 DPS310_REG_TMP_CFG = const(0x07)
 DPS310_REG_MEAS_CFG = const(0x08)
 DPS310_REG_CFG = const(0x09)
+DPS310_REG_INT_STS = const(0x0A)
+DPS310_REG_FIFO_STS = const(0x0B)
 DPS310_REG_RESET = const(0x0C)
 DPS310_REG_ID = const(0x0D)
 DPS310_REG_COEF = const(0x10)         # Coefficient register start
@@ -38,13 +40,26 @@ DPS310_PRS_RATE = const(0x70)          # Pressure measurement rate
 DPS310_PRS_PRC = const(0x07)           # Pressure oversampling rate
 
 # Configuration Register (CFG) bit masks
+DPS310_T_SHIFT = const(0x08)           # Temperature result bit shift (OSR > 8)
+DPS310_P_SHIFT = const(0x04)           # Pressure result bit shift (OSR > 8)
 DPS310_FIFO_EN = const(0x02)           # FIFO enable
 DPS310_SPI_MODE = const(0x01)          # SPI mode
-DPS310_FIFO_EMPTY = const(0x04)        # FIFO empty
-DPS310_FIFO_FULL = const(0x08)         # FIFO full
+
+# FIFO Status (FIFO_STS) bit masks
+DPS310_FIFO_FULL = const(0x02)         # FIFO full
+DPS310_FIFO_EMPTY = const(0x01)        # FIFO empty
 
 # Reset command
 DPS310_RESET_CMD = const(0x89)
+DPS310_FIFO_FLUSH = const(0x80)
+
+# Measurement control values
+DPS310_MEAS_STOP = const(0x00)
+DPS310_MEAS_CONT_BOTH = const(0x07)    # Background pressure and temperature
+
+# FIFO
+DPS310_FIFO_SIZE = const(32)
+DPS310_FIFO_EMPTY_WORD = const(0x800000)  # Read back from an empty FIFO
 
 # Valid configuration values
 DPS310_VALID_OSR = [1, 2, 4, 8, 16, 32, 64, 128]
@@ -53,6 +68,9 @@ DPS310_VALID_RATES = [1, 2, 4, 8, 16, 32, 64, 128]
 # Mapping dictionaries
 DPS310_VALUE_TO_INDEX = {1: 0, 2: 1, 4: 2, 8: 3, 16: 4, 32: 5, 64: 6, 128: 7}
 
+# Measurement time per oversampling rate in us (datasheet table 16)
+DPS310_MEAS_TIME_US = {1: 3600, 2: 5200, 4: 8400, 8: 14800, 16: 27600, 32: 53200, 64: 104400, 128: 206800}
+
 
 class DPS310:
     """Driver for the DPS310 pressure and temperature sensor"""
@@ -86,6 +104,12 @@ class DPS310:
         self.temp_scale = DPS310_VALUE_TO_INDEX[self.temp_osr]
         self.press_scale = DPS310_VALUE_TO_INDEX[self.press_osr]
         
+        # FIFO drain buffer, 3 bytes per entry, and the last temperature
+        # sample used to compensate pressure entries read from the FIFO
+        self.fifo_buf = bytearray(DPS310_FIFO_SIZE * 3)
+        self.fifo_mv = memoryview(self.fifo_buf)
+        self.fifo_T_raw = None
+        
         # Calibration coefficients
         self.C0 = self.C1 = 0
         self.C00 = self.C10 = 0
@@ -139,15 +163,13 @@ class DPS310:
                 value = self.read_uint(reg, 1)
                 if (value & mask) == expected_value:
                     return True
-            except DPS310Error:
+            except OSError:
                 pass
             sleep_ms(poll_ms)
         return False
     
     
     def init(self):
-        cfg_reg = 0x00
-
         sensor_id = self.read_uint(DPS310_REG_ID, 1)
         
         if(sensor_id != 0x10):
@@ -162,35 +184,66 @@ class DPS310:
         coef_src = self.read_uint(DPS310_REG_COEF_SRC, 1)
         
         if(coef_src & 0x80):
-            use_external_temp = DPS310_TMP_EXT
+            self.use_external_temp = DPS310_TMP_EXT
         else:
-            use_external_temp = 0
+            self.use_external_temp = 0
+
+        self.write(DPS310_REG_MEAS_CFG, DPS310_MEAS_STOP)
+        self.apply_config()
+
+        # Wait for coefficients to be ready
+        if not self.wait_for_bit(DPS310_REG_MEAS_CFG, DPS310_COEF_RDY, DPS310_COEF_RDY):
+            raise RuntimeError("Timeout waiting for coefficients") 
+        
+        self.read_coefficients()
 
+
+    def apply_config(self, fifo: bool = False) -> None:
         # Build configuration values
         press_cfg = (DPS310_VALUE_TO_INDEX[self.press_rate] << 4) | DPS310_VALUE_TO_INDEX[self.press_osr]
-        temp_cfg = (use_external_temp | 
+        temp_cfg = (self.use_external_temp | 
                    (DPS310_VALUE_TO_INDEX[self.temp_rate] << 4) | 
                    DPS310_VALUE_TO_INDEX[self.temp_osr])
-
-        # Apply configuration
-        self.write(DPS310_REG_PRS_CFG, press_cfg)
-        self.write(DPS310_REG_TMP_CFG, temp_cfg)
-        self.write(DPS310_REG_MEAS_CFG, 0x00)  # Stop measurements
+        cfg_reg = 0x00
 
         if(self.press_osr > 8):
-            cfg_reg |= 0x04  # P_SHIFT bit
+            cfg_reg |= DPS310_P_SHIFT
 
         if(self.temp_osr > 8):
-            cfg_reg |= 0x08  # T_SHIFT bit   
-
-        self.write(DPS310_REG_CFG, cfg_reg)  
+            cfg_reg |= DPS310_T_SHIFT
+            
+        if(fifo):
+            cfg_reg |= DPS310_FIFO_EN
 
-        # Wait for coefficients to be ready
-        if not self.wait_for_bit(DPS310_REG_MEAS_CFG, DPS310_COEF_RDY, DPS310_COEF_RDY):
-            raise RuntimeError("Timeout waiting for coefficients") 
+        self.write(DPS310_REG_PRS_CFG, press_cfg)
+        self.write(DPS310_REG_TMP_CFG, temp_cfg)
+        self.write(DPS310_REG_CFG, cfg_reg)
+        
+        self.temp_scale = DPS310_VALUE_TO_INDEX[self.temp_osr]
+        self.press_scale = DPS310_VALUE_TO_INDEX[self.press_osr]
         
-        self.read_coefficients()
 
+    def configure(self, temp_osr: int = None, press_osr: int = None,
+                  temp_rate: int = None, press_rate: int = None) -> None:
+        """Change rates/oversampling; measurements are stopped first"""
+        if(temp_osr is not None):
+            self.temp_osr = self.validate_OSR(temp_osr)
+        if(press_osr is not None):
+            self.press_osr = self.validate_OSR(press_osr)
+        if(temp_rate is not None):
+            self.temp_rate = self.validate_rate(temp_rate)
+        if(press_rate is not None):
+            self.press_rate = self.validate_rate(press_rate)
+        
+        self.write(DPS310_REG_MEAS_CFG, DPS310_MEAS_STOP)
+        self.apply_config()
+        
+        
+    def background_load_us(self) -> int:
+        """Conversion time needed per second in background mode, must stay below 1 s"""
+        return ((self.temp_rate * DPS310_MEAS_TIME_US[self.temp_osr]) +
+                (self.press_rate * DPS310_MEAS_TIME_US[self.press_osr]))
+        
 
     def deinit(self):
         self.stop_continuous()
@@ -226,7 +279,7 @@ class DPS310:
     
 
     def read_raw(self):
-        self.write(DPS310_REG_MEAS_CFG, 0x07)
+        self.write(DPS310_REG_MEAS_CFG, DPS310_MEAS_CONT_BOTH)
 
         if not self.wait_for_bit(DPS310_REG_MEAS_CFG, 
                                   DPS310_PRS_RDY | DPS310_TMP_RDY,
@@ -234,7 +287,7 @@ class DPS310:
             raise RuntimeError("Timeout waiting for measurement completion")
         
         # Stop measurement
-        self.write(DPS310_REG_MEAS_CFG, 0x00)
+        self.write(DPS310_REG_MEAS_CFG, DPS310_MEAS_STOP)
         
         # Read both pressure and temperature in one transaction
         data = self.read_bytes(DPS310_REG_PSR_B2, 6)
@@ -282,11 +335,11 @@ class DPS310:
         
         
     def start_continuous(self):
-        self.write(DPS310_REG_MEAS_CFG, 0x07)  # Continuous both
+        self.write(DPS310_REG_MEAS_CFG, DPS310_MEAS_CONT_BOTH)  # Continuous both
 
 
     def stop_continuous(self):
-        self.write(DPS310_REG_MEAS_CFG, 0x00)
+        self.write(DPS310_REG_MEAS_CFG, DPS310_MEAS_STOP)
 
 
     def read_continuous(self):
@@ -305,13 +358,83 @@ class DPS310:
         return self.process_raw(T, P)
     
 
-    def read_fifo(self, count):
+    def start_fifo(self, temp_osr: int = None, press_osr: int = None,
+                   temp_rate: int = None, press_rate: int = None) -> None:
+        """Start background measurements into the on-chip 32 entry FIFO"""
+        self.configure(temp_osr, press_osr, temp_rate, press_rate)
+        
+        if(self.background_load_us() >= 1000000):
+            raise ValueError("Rates and oversampling exceed the background mode time budget")
+        
+        # Seed the temperature used to compensate the first pressure entries
+        self.fifo_T_raw, _ = self.read_raw()
+        
+        self.write(DPS310_REG_RESET, DPS310_FIFO_FLUSH)
+        self.apply_config(fifo = True)
+        self.write(DPS310_REG_MEAS_CFG, DPS310_MEAS_CONT_BOTH)
+        
+        
+    def stop_fifo(self) -> None:
+        self.write(DPS310_REG_MEAS_CFG, DPS310_MEAS_STOP)
+        self.write(DPS310_REG_RESET, DPS310_FIFO_FLUSH)
+        self.apply_config(fifo = False)
+        
+        
+    def fifo_status(self):
+        """Returns (empty, full) flags of the FIFO"""
+        sts = self.read_uint(DPS310_REG_FIFO_STS, 1)
+        return bool(sts & DPS310_FIFO_EMPTY), bool(sts & DPS310_FIFO_FULL)
+    
+    
+    def drain_fifo(self, count: int = DPS310_FIFO_SIZE) -> int:
+        """Move up to count pending entries into fifo_buf, returns the number read"""
+        if(count > DPS310_FIFO_SIZE):
+            count = DPS310_FIFO_SIZE
+        
+        empty, _ = self.fifo_status()
+        if(empty):
+            return 0
+        
+        # Each 3 byte read of PSR_B2..B0 pops one entry; an empty FIFO reads
+        # back DPS310_FIFO_EMPTY_WORD, which ends the drain without re-polling FIFO_STS.
+        mv = self.fifo_mv
+        n = 0
+        try:
+            while(n < count):
+                entry = mv[(n * 3):((n * 3) + 3)]
+                self.i2c.readfrom_mem_into(self.addr, DPS310_REG_PSR_B2, entry)
+                if(((entry[0] << 16) | (entry[1] << 8) | entry[2]) == DPS310_FIFO_EMPTY_WORD):
+                    break
+                n += 1
+        except OSError as e:
+            raise OSError(f"DPS310 FIFO read failed: {e}") from e
+        
+        return n
+    
+    
+    def decode_fifo(self, n: int):
+        """Decode n drained entries into a list of compensated (T, P) pairs"""
         results = []
-        for _ in range(count):
-            if self.wait_for_bit(...):  # Check FIFO not empty
-                results.append(self.read_continuous())
+        buf = self.fifo_buf
+        T_raw = self.fifo_T_raw
+        
+        for i in range(0, (n * 3), 3):
+            raw = self.twos_complement(((buf[i] << 16) | (buf[i + 1] << 8) | buf[i + 2]), 24)
+            
+            # LSB marks the entry type: 1 = pressure, 0 = temperature
+            if(buf[i + 2] & 0x01):
+                if(T_raw is not None):
+                    results.append(self.process_raw(T_raw, raw))
+            else:
+                T_raw = raw
+        
+        self.fifo_T_raw = T_raw
         return results
     
+
+    def read_fifo(self, count: int = DPS310_FIFO_SIZE):
+        return self.decode_fifo(self.drain_fifo(count))
+    
     
     def read_altitude(self, sea_level_pressure = 1013.25):
         try:
@@ -1,5 +1,6 @@
 from micropython import const
 from time import sleep_ms
+from CRC import crc8, check_crc8_word
 
 
 # SHT4x Default I2C Address
@@ -35,10 +36,6 @@ _DELAY_MS = {
     SHT4X_HEAT_20MW_01S:  110,
 }
 
-# CRC polynomial: x^8 + x^5 + x^4 + 1
-SHT4X_CRC_POLY = const(0x31)
-
-
 class SHT4x:
     def __init__(self, i2c, address = SHT4X_I2C_ADDRESS):
         self._i2c = i2c
@@ -114,11 +111,11 @@ class SHT4x:
             print("SHT4x: read failed after retries")
             return False
 
-        if(self._buf[2] != self.compute_crc8(self._buf[0:2])):
+        if not check_crc8_word(self._buf, 0):
             print("SHT4x: temperature CRC error")
             return False
         
-        if(self._buf[5] != self.compute_crc8(self._buf[3:5])):
+        if not check_crc8_word(self._buf, 3):
             print("SHT4x: humidity CRC error")
             return False
 
@@ -138,7 +135,7 @@ class SHT4x:
             print(f"SHT4x: serial read error: {e}")
             return None
 
-        if((self._buf[2] != self.compute_crc8(self._buf[0:2])) or (self._buf[5] != self.compute_crc8(self._buf[3:5]))):
+        if((not check_crc8_word(self._buf, 0)) or (not check_crc8_word(self._buf, 3))):
             print("SHT4x: serial number CRC error")
             return None
 
@@ -161,16 +158,4 @@ class SHT4x:
 
 
     def compute_crc8(self, data):
-        crc = 0xFF
-
-        for byte in data:
-            crc ^= byte
-            
-            for _ in range(8):
-                if(crc & 0x80):
-                    crc = ((crc << 1) ^ SHT4X_CRC_POLY)
-                else:
-                    crc = (crc << 1)
-                crc &= 0xFF
-
-        return crc
+        return crc8(data)
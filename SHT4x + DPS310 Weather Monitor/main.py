@@ -3,10 +3,13 @@ from SHT4x import SHT4x, SHT4X_MEAS_MED_REP
 from DPS310 import DPS310
 from ST7789 import TFT114
 from img import image_data, image_width, image_height
-from time import sleep_ms
+from time import sleep_ms, ticks_us, ticks_diff
 import math
 
 
+SHOW_FRAME_TIME = False         # True prints how long each frame takes to build, in us
+
+
 LED = Pin(25, Pin.OUT)
 display = TFT114()
 i2c = I2C(1, scl = Pin(3), sda = Pin(2), freq = 100000)
@@ -14,6 +17,26 @@ i2c = I2C(1, scl = Pin(3), sda = Pin(2), freq = 100000)
 
 hygrometer = SHT4x(i2c)
 barometer = DPS310(i2c)
+# 8 Hz pressure at 16x OSR plus 1 Hz temperature in background mode,
+# drained from the FIFO once per screen update
+barometer.start_fifo(temp_osr = 1, press_osr = 16, temp_rate = 1, press_rate = 8)
+
+
+def read_barometer():
+    try:
+        samples = barometer.read_fifo()
+    except (OSError, RuntimeError):
+        return None, None
+    
+    if(len(samples) == 0):
+        return None, None
+    
+    tb = 0
+    p = 0
+    for t_sample, p_sample in samples:
+        tb += t_sample
+        p += p_sample
+    return (tb / len(samples)), (p / len(samples))
 
 
 def map_value(v, x_min, x_max, y_min, y_max):
@@ -59,8 +82,19 @@ def draw_dial(x_pos, y_pos, value, value_min, value_max, colour):
     display.text(str("%4.2f " %value), (x_pos - 52), (y_pos + 40), colour)
 
 
+display.fill(display.BLACK)
+display.text("SHT40 & DPS310 Weather Monitor", 0, 2, display.WHITE)
+draw_dials(0, 15)
+draw_dials(81, 15)
+draw_dials(162, 15)
+display.text("T.Avg./'C", 0, 106, display.RED)
+display.text("R. Hum./%", 80, 106, display.BLUE)
+display.text("Prs./mBar", 168, 106, display.MAGENTA)
+display.save_background()
+
+
 while(True):
-    tb, p = barometer.read_sensor()
+    tb, p = read_barometer()
     th, rh = hygrometer.read_sensor()
     
     if((tb != None) and (th != None) and (p != None) and (rh != None)):
@@ -73,19 +107,16 @@ while(True):
         print("R. Humidity/%: " + str("%2.2f" %rh))
         print("Pressure/mBar: " + str("%4.2f" %p))
         
-        display.fill(display.BLACK)
-        display.text("SHT40 & DPS310 Weather Monitor", 0, 2, display.WHITE)
-        draw_dials(0, 15)
-        draw_dials(81, 15)
-        draw_dials(162, 15)
-        
-        display.text("T.Avg./'C", 0, 106, display.RED)
-        display.text("R. Hum./%", 80, 106, display.BLUE)
-        display.text("Prs./mBar", 168, 106, display.MAGENTA)
-        
+        t0 = ticks_us()
+        display.restore_background()
         draw_dial(67, 67, tc, 0, 100, display.RED)
         draw_dial(148, 67, rh, 0, 100, display.BLUE)
         draw_dial(228, 67, p, 750, 1500, display.MAGENTA)
+        build_us = ticks_diff(ticks_us(), t0)
+        
+        if(SHOW_FRAME_TIME):
+            print("Frame build/us: " + str(build_us))
+            
         display.show()
 
     else:
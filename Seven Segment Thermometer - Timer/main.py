@@ -1,6 +1,7 @@
 from machine import Pin, Timer
 from segment_display import seg_disp
 from utime import sleep_ms
+from ADC_DMA import ADC_Sampler
 
 
 conversion_factor = 3.3 / 65535
@@ -33,11 +34,11 @@ def timer_callback(t):
 
 
 tim = Timer(mode = Timer.PERIODIC, period = 1,  callback = timer_callback)
-int_t_sensor = machine.ADC(4)
+int_t_sensor = ADC_Sampler([4])
 disp = seg_disp()
 
 
 while(True):
-    t_reading = int_t_sensor.read_u16() * conversion_factor 
+    t_reading = int_t_sensor.read_u16(4) * conversion_factor 
     value = int((27 - (t_reading - 0.706) / 0.001721) * 10)
     sleep_ms(250)